@@ -31,11 +31,202 @@ export interface InvestigationSummary {
   typeCounts: Record<string, number>;
 }
 
+export interface BreadcrumbSaveOptions {
+  /**
+   * Write JSON without indentation. Compact output stays on V8's fast
+   * JSON.stringify path, which is markedly quicker for large investigations.
+   * Default: false
+   */
+  compact?: boolean;
+  /** Skip the "saved" log line, e.g. for frequent checkpoint saves. Default: false */
+  quiet?: boolean;
+}
+
+const ENCODER = new TextEncoder();
+
+/** Timeline heading icon for each breadcrumb type */
+const BREADCRUMB_ICONS: Readonly<Record<string, string>> = {
+  hypothesis: "❓",
+  test: "🧪",
+  finding: "🔍",
+  decision: "⚡",
+};
+
+/** "<icon> <TYPE>" heading prefix per known type, so render loops do one lookup */
+const BREADCRUMB_HEADINGS: Readonly<Record<string, string>> = Object.fromEntries(
+  Object.entries(BREADCRUMB_ICONS).map(([type, icon]) => [type, `${icon} ${type.toUpperCase()}`]),
+);
+
+function breadcrumbHeading(type: string): string {
+  return BREADCRUMB_HEADINGS[type] ?? `${BREADCRUMB_ICONS[type] || "•"} ${type.toUpperCase()}`;
+}
+
+const SUMMARY_TYPES: readonly BreadcrumbType[] = ["hypothesis", "test", "finding", "decision"];
+
+function appendToIndex(index: Map<string, Breadcrumb[]>, key: string, bc: Breadcrumb): void {
+  const bucket = index.get(key);
+  if (!bucket) {
+    index.set(key, [bc]);
+  } else if (bucket[bucket.length - 1] !== bc) { // a crumb listing a tag twice counts once
+    bucket.push(bc);
+  }
+}
+
+/** Upper-cased org property names; data keys repeat heavily across breadcrumbs */
+const ORG_PROPERTY_NAMES = new Map<string, string>();
+const ORG_PROPERTY_NAMES_LIMIT = 1024;
+
+function orgPropertyName(key: string): string {
+  let name = ORG_PROPERTY_NAMES.get(key);
+  if (name === undefined) {
+    name = key.toUpperCase();
+    if (ORG_PROPERTY_NAMES.size < ORG_PROPERTY_NAMES_LIMIT) {
+      ORG_PROPERTY_NAMES.set(key, name);
+    }
+  }
+  return name;
+}
+
+/** First line of a saveAppend() log */
+interface JsonlHeader {
+  investigationName: string;
+  startTime: string;
+}
+
+/** saveAppend() line recording an answerQuestion() call on an already written breadcrumb */
+interface JsonlAnswer {
+  answered: number;
+  answer: string;
+  answered_at: string;
+}
+
+/** What saveAppend() has already written to one log */
+interface AppendState {
+  breadcrumbs: number;
+  answers: number;
+}
+
+/** A parsed saveAppend() log, with answer records applied to their breadcrumbs */
+interface JsonlLog {
+  header: JsonlHeader;
+  breadcrumbs: Breadcrumb[];
+}
+
+/** Absolute, normalized form of a path, so "./a.jsonl" and "a.jsonl" name the same log */
+function resolvePath(filePath: string): string {
+  const absolute = filePath.startsWith("/") ? filePath : `${Deno.cwd()}/${filePath}`;
+  const parts: string[] = [];
+  for (const part of absolute.split("/")) {
+    if (part === "..") {
+      parts.pop();
+    } else if (part !== "" && part !== ".") {
+      parts.push(part);
+    }
+  }
+  return "/" + parts.join("/");
+}
+
+async function readIfExists(filePath: string): Promise<string> {
+  try {
+    return await Deno.readTextFile(filePath);
+  } catch (error) {
+    if (error instanceof Deno.errors.NotFound) {
+      return "";
+    }
+    throw error;
+  }
+}
+
+function parseJsonLines(content: string, filePath: string): JsonlLog {
+  const lines = content.split("\n");
+  let first = 0;
+  while (first < lines.length && lines[first].trim() === "") {
+    first++;
+  }
+  if (first === lines.length) {
+    throw new Error(`Empty breadcrumb log: ${filePath}`);
+  }
+
+  const header = JSON.parse(lines[first]) as JsonlHeader;
+  if (typeof header?.investigationName !== "string" || typeof header.startTime !== "string") {
+    throw new Error(`Not a breadcrumb log (bad header line): ${filePath}`);
+  }
+
+  const breadcrumbs: Breadcrumb[] = [];
+  for (let i = first + 1; i < lines.length; i++) {
+    if (lines[i].trim() === "") {
+      continue;
+    }
+    const record = JSON.parse(lines[i]);
+    if (typeof record.answered === "number") {
+      const { answered, answer, answered_at } = record as JsonlAnswer;
+      const crumb = breadcrumbs[answered];
+      if (crumb) {
+        crumb.data = { ...crumb.data, answer, answered_at };
+      }
+    } else {
+      breadcrumbs.push(normalizeBreadcrumb(record as Breadcrumb));
+    }
+  }
+  return { header, breadcrumbs };
+}
+
+/**
+ * "YYYY-MM-DD HH:MM[:SS]" (first `length` characters) for a breadcrumb timestamp.
+ * Timestamps written by toISOString() are sliced directly; anything else is parsed.
+ */
+function formatTimestamp(timestamp: string, length: number): string {
+  const iso = timestamp.length === 24 && timestamp[10] === "T" && timestamp[23] === "Z"
+    ? timestamp
+    : new Date(timestamp).toISOString();
+  return iso.substring(0, 10) + " " + iso.substring(11, length);
+}
+
+/**
+ * Rebuild a loaded breadcrumb with the same field layout addBreadcrumb() creates,
+ * so recorded and loaded breadcrumbs share one object shape (and defaults).
+ */
+function normalizeBreadcrumb(raw: Breadcrumb): Breadcrumb {
+  const breadcrumb: Breadcrumb = {
+    timestamp: raw.timestamp,
+    type: raw.type,
+    description: raw.description,
+    data: raw.data || {},
+    tags: raw.tags || [],
+  };
+  if (raw.severity !== undefined) {
+    breadcrumb.severity = raw.severity;
+  }
+  return breadcrumb;
+}
+
 export class Breadcrumbs {
   public investigationName: string;
+  /**
+   * Recorded breadcrumbs, oldest first. Add to it with push() (the add* methods do)
+   * or replace the whole array; getByType()/getByTag() only notice an in-place
+   * removal or reorder when it also changes the last breadcrumb they indexed.
+   */
   public breadcrumbs: Breadcrumb[] = [];
   public startTime: Date;
 
+  // Type/tag lookups, caught up lazily with whatever was appended to `breadcrumbs`
+  // since the last query (and rebuilt if the array was replaced, e.g. by load()).
+  private typeIndex = new Map<string, Breadcrumb[]>();
+  private tagIndex = new Map<string, Breadcrumb[]>();
+  private indexedList: Breadcrumb[] = this.breadcrumbs;
+  private indexedCount = 0;
+  private indexedLast: Breadcrumb | undefined;
+
+  // startTime formatted once; re-derived only if startTime is reassigned or changed
+  private startIso = "";
+  private startIsoTime = NaN;
+
+  /** What saveAppend() has written, per resolved log path */
+  private appendState = new Map<string, AppendState>();
+  /** answerQuestion() calls in order, replayed into saveAppend() logs as answer lines */
+  private answers: JsonlAnswer[] = [];
+
   constructor(investigationName?: string) {
     this.startTime = new Date();
     this.investigationName = investigationName ||
@@ -136,37 +327,77 @@ export class Breadcrumbs {
       const crumb = this.breadcrumbs[questionIndex];
       if (crumb.type === "hypothesis") {
         crumb.data = crumb.data || {};
+        const answeredAt = new Date().toISOString();
         crumb.data.answer = answer;
-        crumb.data.answered_at = new Date().toISOString();
+        crumb.data.answered_at = answeredAt;
+        this.answers.push({ answered: questionIndex, answer, answered_at: answeredAt });
       }
     }
   }
 
+  private startTimeIso(): string {
+    const time = this.startTime.getTime();
+    if (time !== this.startIsoTime) {
+      this.startIso = this.startTime.toISOString();
+      this.startIsoTime = time;
+    }
+    return this.startIso;
+  }
+
   getTimeline(): Breadcrumb[] {
     return this.breadcrumbs;
   }
 
   getByType(type: BreadcrumbType): Breadcrumb[] {
-    return this.breadcrumbs.filter((bc) => bc.type === type);
+    this.syncIndexes();
+    return this.typeIndex.get(type)?.slice() ?? [];
   }
 
   getByTag(tag: string): Breadcrumb[] {
-    return this.breadcrumbs.filter((bc) => bc.tags?.includes(tag));
+    this.syncIndexes();
+    return this.tagIndex.get(tag)?.slice() ?? [];
+  }
+
+  /** Index breadcrumbs added since the last lookup; O(new breadcrumbs) per call */
+  private syncIndexes(): void {
+    const list = this.breadcrumbs;
+    if (
+      list !== this.indexedList || this.indexedCount > list.length ||
+      (this.indexedCount > 0 && list[this.indexedCount - 1] !== this.indexedLast)
+    ) {
+      this.typeIndex.clear();
+      this.tagIndex.clear();
+      this.indexedList = list;
+      this.indexedCount = 0;
+    }
+
+    for (let i = this.indexedCount; i < list.length; i++) {
+      const bc = list[i];
+      appendToIndex(this.typeIndex, bc.type, bc);
+      if (bc.tags) {
+        for (const tag of bc.tags) {
+          appendToIndex(this.tagIndex, tag, bc);
+        }
+      }
+    }
+    this.indexedCount = list.length;
+    this.indexedLast = list[list.length - 1];
   }
 
   getSummary(): InvestigationSummary {
     const now = new Date();
     const duration = (now.getTime() - this.startTime.getTime()) / 1000;
 
-    const types: BreadcrumbType[] = ["hypothesis", "test", "finding", "decision"];
+    // Bucket sizes from the type index: O(types), plus indexing any new breadcrumbs
+    this.syncIndexes();
     const typeCounts: Record<string, number> = {};
-    for (const type of types) {
-      typeCounts[type] = this.getByType(type).length;
+    for (const type of SUMMARY_TYPES) {
+      typeCounts[type] = this.typeIndex.get(type)?.length ?? 0;
     }
 
     return {
       investigationName: this.investigationName,
-      startTime: this.startTime.toISOString(),
+      startTime: this.startTimeIso(),
       durationSeconds: duration,
       breadcrumbCount: this.breadcrumbs.length,
       typeCounts,
@@ -174,108 +405,198 @@ export class Breadcrumbs {
   }
 
   toOrgTimeline(): string {
-    const lines: string[] = [
-      `* Investigation Timeline: ${this.investigationName}`,
-      `  :PROPERTIES:`,
-      `  :START_TIME: ${this.startTime.toISOString()}`,
-      `  :END:`,
-      "",
-    ];
+    // Appended into one string (V8 keeps it as a rope) instead of a line array plus join;
+    // every line carries its own newline and the final one is dropped on return.
+    let out = `* Investigation Timeline: ${this.investigationName}\n` +
+      `  :PROPERTIES:\n` +
+      `  :START_TIME: ${this.startTimeIso()}\n` +
+      `  :END:\n` +
+      "\n";
 
     for (let i = 0; i < this.breadcrumbs.length; i++) {
       const bc = this.breadcrumbs[i];
-      const ts = new Date(bc.timestamp);
-      const orgTs = ts.toISOString().replace("T", " ").substring(0, 16);
-
-      const icon: Record<string, string> = {
-        "hypothesis": "❓",
-        "test": "🧪",
-        "finding": "🔍",
-        "decision": "⚡",
-      };
-
-      lines.push(`** ${icon[bc.type] || "•"} ${bc.type.toUpperCase()}: ${bc.description}`);
-      lines.push(`   [${orgTs}]`);
-
-      if (bc.data && Object.keys(bc.data).length > 0) {
-        lines.push("   :PROPERTIES:");
-        for (const [key, value] of Object.entries(bc.data)) {
-          const valStr = typeof value === "object" ? JSON.stringify(value, null, 2) : String(value);
-          lines.push(`   :${key.toUpperCase()}: ${valStr}`);
+      const orgTs = formatTimestamp(bc.timestamp, 16);
+
+      out += `** ${breadcrumbHeading(bc.type)}: ${bc.description}\n`;
+      out += `   [${orgTs}]\n`;
+
+      // Walk data keys in place rather than copying them out with Object.keys/entries
+      const data = bc.data;
+      let hasProperties = false;
+      for (const key in data) {
+        if (!hasProperties) {
+          out += "   :PROPERTIES:\n";
+          hasProperties = true;
         }
-        lines.push("   :END:");
+        const value = data[key];
+        const valStr = typeof value === "object" ? JSON.stringify(value, null, 2) : String(value);
+        out += `   :${orgPropertyName(key)}: ${valStr}\n`;
+      }
+      if (hasProperties) {
+        out += "   :END:\n";
       }
 
       if (bc.tags && bc.tags.length > 0) {
-        lines.push(`   Tags: ${bc.tags.join(", ")}`);
+        out += `   Tags: ${bc.tags.join(", ")}\n`;
       }
 
-      lines.push("");
+      out += "\n";
     }
 
-    return lines.join("\n");
+    return out.slice(0, -1);
   }
 
   toMarkdownTimeline(): string {
-    const lines: string[] = [
-      `# Investigation Timeline: ${this.investigationName}`,
-      `Started: ${this.startTime.toISOString()}`,
-      "",
-    ];
+    // Same single-string builder as toOrgTimeline
+    let out = `# Investigation Timeline: ${this.investigationName}\n` +
+      `Started: ${this.startTimeIso()}\n` +
+      "\n";
 
     for (let i = 0; i < this.breadcrumbs.length; i++) {
       const bc = this.breadcrumbs[i];
-      const ts = new Date(bc.timestamp);
-
-      const icon: Record<string, string> = {
-        "hypothesis": "❓",
-        "test": "🧪",
-        "finding": "🔍",
-        "decision": "⚡",
-      };
-
-      lines.push(
-        `## ${i + 1}. ${icon[bc.type] || "•"} ${bc.type.toUpperCase()}: ${bc.description}`,
-      );
-      lines.push(`*${ts.toISOString().replace("T", " ").substring(0, 19)}*`);
-      lines.push("");
-
-      if (bc.data && Object.keys(bc.data).length > 0) {
-        for (const [key, value] of Object.entries(bc.data)) {
-          lines.push(`- **${key}**: ${value}`);
-        }
-        lines.push("");
+      // One template per block: heading + timestamp, details, tags
+      out += `## ${i + 1}. ${breadcrumbHeading(bc.type)}: ${bc.description}\n` +
+        `*${formatTimestamp(bc.timestamp, 19)}*\n\n`;
+
+      const data = bc.data;
+      let details = "";
+      for (const key in data) {
+        details += `- **${key}**: ${data[key]}\n`;
+      }
+      if (details) {
+        out += details + "\n";
       }
 
       if (bc.tags && bc.tags.length > 0) {
-        lines.push(`Tags: \`${bc.tags.join(", ")}\``);
-        lines.push("");
+        out += `Tags: \`${bc.tags.join(", ")}\`\n\n`;
       }
     }
 
-    return lines.join("\n");
+    return out.slice(0, -1);
   }
 
-  async save(filePath: string): Promise<void> {
+  /** UTF-8 markdown timeline, ready to write to a file or socket */
+  toMarkdownBytes(): Uint8Array {
+    // The timeline is built as one rope, so this is a single encode pass with no
+    // extra line array or join in between
+    return ENCODER.encode(this.toMarkdownTimeline());
+  }
+
+  async save(filePath: string, options: BreadcrumbSaveOptions = {}): Promise<void> {
     const data: BreadcrumbData = {
       investigationName: this.investigationName,
-      startTime: this.startTime.toISOString(),
+      startTime: this.startTimeIso(),
       breadcrumbs: this.breadcrumbs,
       summary: this.getSummary(),
     };
 
-    await Deno.writeTextFile(filePath, JSON.stringify(data, null, 2));
-    console.log(`Breadcrumbs saved to ${filePath}`);
+    const json = options.compact ? JSON.stringify(data) : JSON.stringify(data, null, 2);
+    // One pre-encoded buffer, one write
+    await Deno.writeFile(filePath, ENCODER.encode(json));
+    if (!options.quiet) {
+      console.log(`Breadcrumbs saved to ${filePath}`);
+    }
+  }
+
+  /**
+   * Append the breadcrumbs recorded since the previous saveAppend() to a JSON Lines
+   * file, one breadcrumb per line. Unlike save(), checkpoints cost only the new
+   * breadcrumbs. A new file starts with a header line holding the investigation
+   * name and start time; load() reads the file back when its path ends in ".jsonl".
+   *
+   * answerQuestion() on a breadcrumb that is already in the file is written as an
+   * extra answer line, which load() applies to that breadcrumb.
+   *
+   * The first saveAppend() to an existing, non-empty file reads it once: the header
+   * must name this investigation (otherwise this throws and nothing is written), and
+   * appending continues after the breadcrumbs already in the file.
+   *
+   * @returns Number of breadcrumbs written
+   */
+  async saveAppend(filePath: string): Promise<number> {
+    const key = resolvePath(filePath);
+    let text = "";
+    let state = this.appendState.get(key);
+    if (!state) {
+      state = await this.openAppendLog(filePath);
+      if (state.breadcrumbs === 0 && state.answers === 0) {
+        const header: JsonlHeader = {
+          investigationName: this.investigationName,
+          startTime: this.startTimeIso(),
+        };
+        text += JSON.stringify(header) + "\n";
+      }
+    }
+
+    const from = Math.min(state.breadcrumbs, this.breadcrumbs.length);
+    for (let i = state.answers; i < this.answers.length; i++) {
+      // Breadcrumbs written below already carry their answer
+      if (this.answers[i].answered < from) {
+        text += JSON.stringify(this.answers[i]) + "\n";
+      }
+    }
+    for (let i = from; i < this.breadcrumbs.length; i++) {
+      text += JSON.stringify(this.breadcrumbs[i]) + "\n";
+    }
+
+    if (text) {
+      await Deno.writeFile(filePath, ENCODER.encode(text), { append: true });
+    }
+    this.appendState.set(key, {
+      breadcrumbs: this.breadcrumbs.length,
+      answers: this.answers.length,
+    });
+    return this.breadcrumbs.length - from;
+  }
+
+  /**
+   * Append position for a log this instance has not written yet; an empty state means
+   * the file is missing or empty and needs a header.
+   */
+  private async openAppendLog(filePath: string): Promise<AppendState> {
+    const content = await readIfExists(filePath);
+    if (content.trim() === "") {
+      return { breadcrumbs: 0, answers: 0 };
+    }
+
+    const { header, breadcrumbs } = parseJsonLines(content, filePath);
+    if (
+      header.investigationName !== this.investigationName ||
+      header.startTime !== this.startTimeIso()
+    ) {
+      throw new Error(
+        `${filePath} belongs to investigation "${header.investigationName}" ` +
+          `(started ${header.startTime}), not "${this.investigationName}"`,
+      );
+    }
+    // The file cannot show which of this instance's answers it already has; rewriting
+    // an answer line is harmless, so replay them all
+    return { breadcrumbs: breadcrumbs.length, answers: 0 };
   }
 
   static async load(filePath: string): Promise<Breadcrumbs> {
     const content = await Deno.readTextFile(filePath);
+    if (filePath.endsWith(".jsonl")) {
+      return Breadcrumbs.fromJsonLines(content, filePath);
+    }
+
     const data = JSON.parse(content) as BreadcrumbData;
 
     const bc = new Breadcrumbs(data.investigationName);
     bc.startTime = new Date(data.startTime);
-    bc.breadcrumbs = data.breadcrumbs;
+    bc.breadcrumbs = data.breadcrumbs.map(normalizeBreadcrumb);
+
+    return bc;
+  }
+
+  private static fromJsonLines(content: string, filePath: string): Breadcrumbs {
+    const { header, breadcrumbs } = parseJsonLines(content, filePath);
+    const bc = new Breadcrumbs(header.investigationName);
+    bc.startTime = new Date(header.startTime);
+    bc.breadcrumbs = breadcrumbs;
 
+    // Appending to the same log continues after what is already there
+    bc.appendState.set(resolvePath(filePath), { breadcrumbs: breadcrumbs.length, answers: 0 });
     return bc;
   }
 }
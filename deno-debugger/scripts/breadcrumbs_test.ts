@@ -2,7 +2,11 @@
  * Tests for breadcrumbs tracking system
  */
 
-import { assertEquals, assertExists } from "https://deno.land/std@0.224.0/assert/mod.ts";
+import {
+  assertEquals,
+  assertExists,
+  assertRejects,
+} from "https://deno.land/std@0.224.0/assert/mod.ts";
 import { Breadcrumbs } from "./breadcrumbs.ts";
 
 Deno.test("Breadcrumbs - constructor creates instance", () => {
@@ -92,3 +96,236 @@ Deno.test("Breadcrumbs - save and load work correctly", async () => {
     await Deno.remove(tempFile);
   }
 });
+
+Deno.test("Breadcrumbs - compact save round-trips", async () => {
+  const tempFile = await Deno.makeTempFile({ suffix: ".json" });
+
+  try {
+    const bc = new Breadcrumbs("compact_test");
+    bc.addFinding("F1", { nested: { value: 1 } }, "warning");
+    await bc.save(tempFile, { compact: true, quiet: true });
+
+    const content = await Deno.readTextFile(tempFile);
+    assertEquals(content.includes("\n"), false);
+    const loaded = await Breadcrumbs.load(tempFile);
+    assertEquals(loaded.breadcrumbs, bc.breadcrumbs);
+  } finally {
+    await Deno.remove(tempFile);
+  }
+});
+
+function makeTimelineBreadcrumbs(): Breadcrumbs {
+  const bc = new Breadcrumbs("timeline");
+  bc.startTime = new Date("2024-05-01T10:00:00.000Z");
+  bc.addHypothesis("Cache grows", "Heap climbs", ["memory"]);
+  bc.addFinding("Map never cleared", { entries: 1200, sample: { key: "a" } }, "critical");
+  bc.addNote("Plain note");
+  bc.breadcrumbs.forEach((crumb, i) => crumb.timestamp = `2024-05-01T10:0${i + 1}:30.000Z`);
+  return bc;
+}
+
+Deno.test("Breadcrumbs - toMarkdownTimeline renders details and tags", () => {
+  assertEquals(
+    makeTimelineBreadcrumbs().toMarkdownTimeline(),
+    [
+      "# Investigation Timeline: timeline",
+      "Started: 2024-05-01T10:00:00.000Z",
+      "",
+      "## 1. ❓ HYPOTHESIS: Cache grows",
+      "*2024-05-01 10:01:30*",
+      "",
+      "- **rationale**: Heap climbs",
+      "",
+      "Tags: `memory`",
+      "",
+      "## 2. 🔍 FINDING: Map never cleared",
+      "*2024-05-01 10:02:30*",
+      "",
+      "- **entries**: 1200",
+      "- **sample**: [object Object]",
+      "- **severity**: critical",
+      "",
+      "## 3. 🔍 FINDING: Plain note",
+      "*2024-05-01 10:03:30*",
+      "",
+    ].join("\n"),
+  );
+});
+
+Deno.test("Breadcrumbs - toMarkdownBytes encodes the markdown timeline", () => {
+  const bc = makeTimelineBreadcrumbs();
+  assertEquals(new TextDecoder().decode(bc.toMarkdownBytes()), bc.toMarkdownTimeline());
+});
+
+Deno.test("Breadcrumbs - toOrgTimeline renders properties", () => {
+  assertEquals(
+    makeTimelineBreadcrumbs().toOrgTimeline(),
+    [
+      "* Investigation Timeline: timeline",
+      "  :PROPERTIES:",
+      "  :START_TIME: 2024-05-01T10:00:00.000Z",
+      "  :END:",
+      "",
+      "** ❓ HYPOTHESIS: Cache grows",
+      "   [2024-05-01 10:01]",
+      "   :PROPERTIES:",
+      "   :RATIONALE: Heap climbs",
+      "   :END:",
+      "   Tags: memory",
+      "",
+      "** 🔍 FINDING: Map never cleared",
+      "   [2024-05-01 10:02]",
+      "   :PROPERTIES:",
+      "   :ENTRIES: 1200",
+      "   :SAMPLE: {",
+      '  "key": "a"',
+      "}",
+      "   :SEVERITY: critical",
+      "   :END:",
+      "",
+      "** 🔍 FINDING: Plain note",
+      "   [2024-05-01 10:03]",
+      "",
+    ].join("\n"),
+  );
+});
+
+Deno.test("Breadcrumbs - getByTag and getByType follow appends and replaced arrays", () => {
+  const bc = new Breadcrumbs();
+  bc.addHypothesis("H1", undefined, ["memory", "memory"]);
+  bc.addFinding("F1", {}, "info", ["memory", "cpu"]);
+  assertEquals(bc.getByTag("memory").map((b) => b.description), ["H1", "F1"]);
+
+  bc.addNote("N1", ["cpu"]);
+  assertEquals(bc.getByTag("cpu").map((b) => b.description), ["F1", "N1"]);
+  assertEquals(bc.getByTag("missing"), []);
+
+  bc.breadcrumbs = bc.breadcrumbs.slice(0, 1);
+  assertEquals(bc.getByType("finding"), []);
+  assertEquals(bc.getByType("hypothesis").length, 1);
+});
+
+Deno.test("Breadcrumbs - lookups rebuild after an in-place edit keeps the length", () => {
+  const bc = new Breadcrumbs();
+  bc.addHypothesis("H1", undefined, ["memory"]);
+  bc.addNote("N1", ["memory"]);
+  assertEquals(bc.getByTag("memory").length, 2);
+
+  // Same array, same length, different contents
+  bc.breadcrumbs.splice(0, 1);
+  bc.addNote("N2", ["cpu"]);
+  assertEquals(bc.getByTag("memory").map((b) => b.description), ["N1"]);
+  assertEquals(bc.getByTag("cpu").map((b) => b.description), ["N2"]);
+  assertEquals(bc.getByType("hypothesis"), []);
+});
+
+Deno.test("Breadcrumbs - saveAppend writes only new breadcrumbs as JSON Lines", async () => {
+  const dir = await Deno.makeTempDir();
+  const logFile = `${dir}/investigation.jsonl`;
+
+  try {
+    const bc = new Breadcrumbs("append_test");
+    bc.addHypothesis("H1", "R1");
+    assertEquals(await bc.saveAppend(logFile), 1);
+    bc.addFinding("F1", { data: 123 });
+    bc.addNote("N1");
+    assertEquals(await bc.saveAppend(logFile), 2);
+    assertEquals(await bc.saveAppend(logFile), 0);
+
+    const lines = (await Deno.readTextFile(logFile)).trimEnd().split("\n");
+    assertEquals(lines.length, 4); // header + 3 breadcrumbs
+
+    const loaded = await Breadcrumbs.load(logFile);
+    assertEquals(loaded.investigationName, "append_test");
+    assertEquals(loaded.startTime.getTime(), bc.startTime.getTime());
+    assertEquals(loaded.breadcrumbs, bc.breadcrumbs);
+
+    // Resuming from the log appends after the existing entries
+    loaded.addDecision("D1", "R2");
+    assertEquals(await loaded.saveAppend(logFile), 1);
+    assertEquals((await Breadcrumbs.load(logFile)).breadcrumbs.length, 4);
+  } finally {
+    await Deno.remove(dir, { recursive: true });
+  }
+});
+
+Deno.test("Breadcrumbs - saveAppend refuses a log from another investigation", async () => {
+  const dir = await Deno.makeTempDir();
+  const logFile = `${dir}/investigation.jsonl`;
+
+  try {
+    const first = new Breadcrumbs("first");
+    first.addNote("N1");
+    await first.saveAppend(logFile);
+    const before = await Deno.readTextFile(logFile);
+
+    const other = new Breadcrumbs("other");
+    other.addNote("N2");
+    await assertRejects(() => other.saveAppend(logFile), Error, "belongs to investigation");
+    assertEquals(await Deno.readTextFile(logFile), before);
+
+    // The same investigation restored from a .json save continues after the log's entries
+    const jsonFile = `${dir}/investigation.json`;
+    first.addNote("N2");
+    await first.save(jsonFile, { quiet: true });
+    const restored = await Breadcrumbs.load(jsonFile);
+    assertEquals(await restored.saveAppend(logFile), 1);
+    assertEquals((await Breadcrumbs.load(logFile)).breadcrumbs, first.breadcrumbs);
+  } finally {
+    await Deno.remove(dir, { recursive: true });
+  }
+});
+
+Deno.test("Breadcrumbs - saveAppend treats different spellings of a path as one log", async () => {
+  const dir = await Deno.makeTempDir();
+  const cwd = Deno.cwd();
+
+  try {
+    Deno.chdir(dir);
+    const bc = new Breadcrumbs("paths");
+    bc.addNote("N1");
+    assertEquals(await bc.saveAppend("./investigation.jsonl"), 1);
+    assertEquals(await bc.saveAppend("investigation.jsonl"), 0);
+    assertEquals(await bc.saveAppend(`${dir}/sub/../investigation.jsonl`), 0);
+
+    const loaded = await Breadcrumbs.load("./investigation.jsonl");
+    loaded.addNote("N2");
+    assertEquals(await loaded.saveAppend("investigation.jsonl"), 1);
+    assertEquals((await Breadcrumbs.load("investigation.jsonl")).breadcrumbs.length, 2);
+  } finally {
+    Deno.chdir(cwd);
+    await Deno.remove(dir, { recursive: true });
+  }
+});
+
+Deno.test("Breadcrumbs - saveAppend records answers to already written questions", async () => {
+  const dir = await Deno.makeTempDir();
+  const logFile = `${dir}/investigation.jsonl`;
+
+  try {
+    const bc = new Breadcrumbs("answers");
+    bc.addQuestion("Q1");
+    bc.addQuestion("Q2");
+    await bc.saveAppend(logFile);
+
+    bc.answerQuestion(0, "A1");
+    assertEquals(await bc.saveAppend(logFile), 0);
+    bc.addQuestion("Q3");
+    bc.answerQuestion(2, "A3"); // not written yet: goes out with the breadcrumb itself
+    assertEquals(await bc.saveAppend(logFile), 1);
+
+    const lines = (await Deno.readTextFile(logFile)).trimEnd().split("\n");
+    assertEquals(lines.length, 5); // header, Q1, Q2, answer to Q1, Q3
+
+    const loaded = await Breadcrumbs.load(logFile);
+    assertEquals(loaded.breadcrumbs, bc.breadcrumbs);
+    assertEquals(loaded.breadcrumbs[0].data?.answer, "A1");
+
+    // Answers given after resuming from the log are appended too
+    loaded.answerQuestion(1, "A2");
+    assertEquals(await loaded.saveAppend(logFile), 0);
+    assertEquals((await Breadcrumbs.load(logFile)).breadcrumbs[1].data?.answer, "A2");
+  } finally {
+    await Deno.remove(dir, { recursive: true });
+  }
+});
@@ -15,7 +15,6 @@ import type {
   BreakpointLocation,
   CallFrame,
   CDPEvent,
-  CDPRequest,
   CDPResponse,
   CDPTarget,
   CPUProfileData,
@@ -27,6 +26,37 @@ export interface Breakpoint {
   location: BreakpointLocation;
 }
 
+/** How long sendCommand waits for a response before rejecting */
+const COMMAND_TIMEOUT_MS = 30000;
+
+/** Node count at which heap snapshot progress is first logged; doubles after each line */
+const HEAP_PROGRESS_FIRST_LOG = 20000;
+
+/** Buffered snapshot text (in UTF-16 units) before takeHeapSnapshotToFile issues a write */
+const HEAP_WRITE_BATCH_CHARS = 1024 * 1024;
+
+/** Decodes binary frames; the inspector normally sends text, which needs no decode */
+const DECODER = new TextDecoder();
+
+/** Cached `,"method":"..."` fragments, one per method sent */
+const METHOD_FRAGMENTS = new Map<string, string>();
+
+/**
+ * Serialize a command frame. The quoted method is built once per method and
+ * reused, so each call formats only the id and, when present, the params;
+ * no request object is allocated just to be walked by JSON.stringify.
+ */
+function commandFrame(id: number, method: string, params?: Record<string, unknown>): string {
+  let fragment = METHOD_FRAGMENTS.get(method);
+  if (fragment === undefined) {
+    fragment = `,"method":${JSON.stringify(method)}`;
+    METHOD_FRAGMENTS.set(method, fragment);
+  }
+  return params
+    ? `{"id":${id}${fragment},"params":${JSON.stringify(params)}}`
+    : `{"id":${id}${fragment}}`;
+}
+
 type EventHandler = (params: Record<string, unknown>) => void | Promise<void>;
 
 export class CDPClient {
@@ -37,10 +67,16 @@ export class CDPClient {
   private pendingRequests = new Map<number, {
     resolve: (value: Record<string, unknown>) => void;
     reject: (error: Error) => void;
+    timer: ReturnType<typeof setTimeout>;
   }>();
-  private eventHandlers = new Map<string, EventHandler[]>();
+  // One entry object per onEvent() call, so registering a handler twice runs it twice
+  // and each disposer removes only its own registration
+  private eventHandlers = new Map<string, Set<{ handler: EventHandler }>>();
   public paused = false;
   public callFrames: CallFrame[] = [];
+  private framesById = new Map<string, CallFrame>();
+  /** callFrames array framesById was built from; rebuilt if callFrames is replaced */
+  private indexedFrames: CallFrame[] = this.callFrames;
   public runtimeInfo: {
     isDeno: boolean;
     isNode: boolean;
@@ -68,18 +104,21 @@ export class CDPClient {
     const target = targets[0];
     const wsUrl = target.webSocketDebuggerUrl;
 
-    // Detect runtime from target info
-    const description = (target.description || "").toLowerCase();
-    const title = (target.title || "").toLowerCase();
+    // Detect runtime from target info; one lowercase copy covers both fields
+    const description = target.description || "";
+    const title = target.title || "";
+    const combined = `${description}\0${title}`.toLowerCase();
     this.runtimeInfo = {
-      isDeno: description.includes("deno") || title.includes("deno"),
-      isNode: description.includes("node") || title.includes("node"),
-      description: target.description || "",
-      title: target.title || "",
+      isDeno: combined.includes("deno"),
+      isNode: combined.includes("node"),
+      description,
+      title,
     };
 
     // Connect to WebSocket
     this.ws = new WebSocket(wsUrl);
+    // Binary frames as ArrayBuffer decode directly, without a Blob round trip
+    this.ws.binaryType = "arraybuffer";
 
     // Set up event handlers
     return new Promise((resolve, reject) => {
@@ -88,11 +127,9 @@ export class CDPClient {
         return;
       }
 
-      this.ws.onopen = () => {
-        this.startMessageHandler();
-        // Give message handler a moment to start
-        setTimeout(() => resolve(this), 100);
-      };
+      // onmessage is a plain callback, so it is live before the first frame can arrive
+      this.startMessageHandler();
+      this.ws.onopen = () => resolve(this);
 
       this.ws.onerror = (event) => {
         reject(new Error(`WebSocket error: ${event}`));
@@ -112,7 +149,8 @@ export class CDPClient {
 
     this.ws.onmessage = (event) => {
       try {
-        const data = JSON.parse(event.data as string);
+        const raw = event.data;
+        const data = JSON.parse(typeof raw === "string" ? raw : DECODER.decode(raw));
 
         // Handle responses to our requests
         if ("id" in data) {
@@ -120,6 +158,7 @@ export class CDPClient {
           const pending = this.pendingRequests.get(response.id);
           if (pending) {
             this.pendingRequests.delete(response.id);
+            clearTimeout(pending.timer);
             if (response.error) {
               pending.reject(new Error(response.error.message));
             } else {
@@ -144,11 +183,18 @@ export class CDPClient {
           // Notify registered handlers
           const handlers = this.eventHandlers.get(method);
           if (handlers) {
-            for (const handler of handlers) {
-              // Run handler async
-              Promise.resolve(handler(params)).catch((err) => {
+            for (const { handler } of handlers) {
+              // Call inline; only async handlers need a rejection hook
+              try {
+                const result = handler(params);
+                if (result) {
+                  result.catch((err) => {
+                    console.error(`Event handler error for ${method}:`, err);
+                  });
+                }
+              } catch (err) {
                 console.error(`Event handler error for ${method}:`, err);
-              });
+              }
             }
           }
         }
@@ -161,48 +207,98 @@ export class CDPClient {
   /**
    * Send a CDP command and wait for response.
    */
-  async sendCommand(
+  sendCommand(
     method: string,
     params?: Record<string, unknown>,
   ): Promise<Record<string, unknown>> {
     if (!this.ws || this.ws.readyState !== WebSocket.OPEN) {
-      throw new Error("WebSocket not connected");
+      return Promise.reject(new Error("WebSocket not connected"));
     }
 
     const msgId = this.nextId++;
-    const message: CDPRequest = {
-      id: msgId,
-      method,
-    };
-
-    if (params) {
-      message.params = params;
-    }
-
-    // Create promise for response
-    const responsePromise = new Promise<Record<string, unknown>>((resolve, reject) => {
-      this.pendingRequests.set(msgId, { resolve, reject });
+    const frame = commandFrame(msgId, method, params);
+
+    // One promise per command; its timeout is cleared as soon as the response arrives
+    const ws = this.ws;
+    return new Promise<Record<string, unknown>>((resolve, reject) => {
+      const timer = setTimeout(() => {
+        this.pendingRequests.delete(msgId);
+        reject(new Error(`Command timeout: ${method}`));
+      }, COMMAND_TIMEOUT_MS);
+      this.pendingRequests.set(msgId, { resolve, reject, timer });
+      try {
+        ws.send(frame);
+      } catch (err) {
+        // The socket can close between the readyState check and the send
+        clearTimeout(timer);
+        this.pendingRequests.delete(msgId);
+        reject(err);
+      }
     });
+  }
 
-    // Send message
-    this.ws.send(JSON.stringify(message));
+  /**
+   * Send several CDP commands back to back and wait for all responses.
+   *
+   * Every frame goes out before the first response is awaited, so N
+   * independent calls cost one round trip instead of N.
+   */
+  sendCommands(
+    calls: Array<[method: string, params?: Record<string, unknown>]>,
+  ): Promise<Array<Record<string, unknown>>> {
+    return Promise.all(calls.map(([method, params]) => this.sendCommand(method, params)));
+  }
 
-    // Wait for response with timeout
-    const timeoutPromise = new Promise<never>((_, reject) => {
-      setTimeout(() => reject(new Error(`Command timeout: ${method}`)), 30000);
-    });
+  /**
+   * Register an event handler. Returns a function that removes this registration
+   * again; a handler registered twice runs twice until both are removed.
+   */
+  onEvent(eventName: string, handler: EventHandler): () => void {
+    const entry = { handler };
+    const handlers = this.eventHandlers.get(eventName);
+    if (handlers) {
+      handlers.add(entry);
+    } else {
+      this.eventHandlers.set(eventName, new Set([entry]));
+    }
+    // Set removal is O(1) and safe while the set is being dispatched
+    return () => void this.eventHandlers.get(eventName)?.delete(entry);
+  }
 
-    return await Promise.race([responsePromise, timeoutPromise]);
+  /**
+   * Run `fn` with the given handlers registered, removing them however it exits.
+   */
+  async withEventHandlers<T>(
+    handlers: Record<string, EventHandler>,
+    fn: () => Promise<T>,
+  ): Promise<T> {
+    const disposers = Object.entries(handlers).map(([name, handler]) =>
+      this.onEvent(name, handler)
+    );
+    try {
+      return await fn();
+    } finally {
+      for (const dispose of disposers) {
+        dispose();
+      }
+    }
   }
 
   /**
-   * Register an event handler.
+   * Remove one registration of a previously registered event handler (the oldest,
+   * if it was registered more than once).
    */
-  onEvent(eventName: string, handler: EventHandler): void {
-    if (!this.eventHandlers.has(eventName)) {
-      this.eventHandlers.set(eventName, []);
+  offEvent(eventName: string, handler: EventHandler): void {
+    const handlers = this.eventHandlers.get(eventName);
+    if (!handlers) {
+      return;
+    }
+    for (const entry of handlers) {
+      if (entry.handler === handler) {
+        handlers.delete(entry);
+        return;
+      }
     }
-    this.eventHandlers.get(eventName)!.push(handler);
   }
 
   // ============================================================================
@@ -210,9 +306,8 @@ export class CDPClient {
   // ============================================================================
 
   async enableDebugger(): Promise<void> {
-    await this.sendCommand("Debugger.enable");
-    // Also enable Runtime for evaluation
-    await this.sendCommand("Runtime.enable");
+    // Also enable Runtime for evaluation; both go out before either reply
+    await this.sendCommands([["Debugger.enable"], ["Runtime.enable"]]);
   }
 
   async disableDebugger(): Promise<void> {
@@ -289,10 +384,68 @@ export class CDPClient {
     await this.sendCommand("Debugger.setPauseOnExceptions", { state });
   }
 
+  /**
+   * Resolve with the call frames of the next Debugger.paused event.
+   */
+  waitForPaused(timeoutMs = COMMAND_TIMEOUT_MS): Promise<CallFrame[]> {
+    return this.nextPause(timeoutMs).promise;
+  }
+
+  /**
+   * Step over `n` times, waiting on each Debugger.paused event rather than
+   * polling. Steps cannot be pipelined: V8 only accepts a step while paused.
+   */
+  async stepOverN(n: number, timeoutMs = COMMAND_TIMEOUT_MS): Promise<CallFrame[]> {
+    for (let i = 0; i < n; i++) {
+      // Listen before sending so a pause that beats the response is not missed
+      const pause = this.nextPause(timeoutMs);
+      try {
+        await this.stepOver();
+      } catch (err) {
+        pause.cancel();
+        throw err;
+      }
+      await pause.promise;
+    }
+    return this.callFrames;
+  }
+
+  private nextPause(timeoutMs: number): { promise: Promise<CallFrame[]>; cancel: () => void } {
+    let cancel = () => {};
+    const promise = new Promise<CallFrame[]>((resolve, reject) => {
+      const handler = () => {
+        cancel();
+        resolve(this.callFrames);
+      };
+      const timer = setTimeout(() => {
+        cancel();
+        reject(new Error("Timed out waiting for Debugger.paused"));
+      }, timeoutMs);
+      const dispose = this.onEvent("Debugger.paused", handler);
+      cancel = () => {
+        clearTimeout(timer);
+        dispose();
+      };
+    });
+    return { promise, cancel };
+  }
+
   getCallFrames(): CallFrame[] {
     return this.callFrames;
   }
 
+  /**
+   * Look up a frame of the current pause by id. The index is built once per
+   * pause rather than scanning the stack on every lookup.
+   */
+  getCallFrame(callFrameId: string): CallFrame | undefined {
+    if (this.indexedFrames !== this.callFrames) {
+      this.framesById = new Map(this.callFrames.map((f) => [f.callFrameId, f]));
+      this.indexedFrames = this.callFrames;
+    }
+    return this.framesById.get(callFrameId);
+  }
+
   async evaluate(
     expression: string,
     callFrameId?: string,
@@ -331,22 +484,23 @@ export class CDPClient {
   }
 
   async getScopeVariables(callFrameId: string): Promise<Record<string, unknown>> {
-    const frame = this.callFrames.find((f) => f.callFrameId === callFrameId);
+    const frame = this.getCallFrame(callFrameId);
     if (!frame) {
       return {};
     }
 
     const variables: Record<string, unknown> = {};
 
-    // Get variables from each scope chain
-    for (const scope of frame.scopeChain || []) {
-      const scopeObj = scope.object;
-      if (scopeObj.objectId) {
-        const props = await this.getProperties(scopeObj.objectId);
-        for (const prop of props) {
-          if (prop.name) {
-            variables[prop.name as string] = prop.value;
-          }
+    // Fetch every scope in the chain concurrently, then merge in chain order
+    const scopeProps = await Promise.all(
+      (frame.scopeChain || [])
+        .filter((scope) => scope.object.objectId)
+        .map((scope) => this.getProperties(scope.object.objectId!)),
+    );
+    for (const props of scopeProps) {
+      for (const prop of props) {
+        if (prop.name) {
+          variables[prop.name as string] = prop.value;
         }
       }
     }
@@ -362,69 +516,120 @@ export class CDPClient {
     await this.sendCommand("HeapProfiler.enable");
   }
 
+  /**
+   * Capture a heap snapshot as one string. Holds every chunk plus the joined
+   * text in memory; prefer takeHeapSnapshotToFile() for anything but small heaps.
+   */
   async takeHeapSnapshot(reportProgress = false): Promise<string> {
     const chunks: string[] = [];
-    let progressDone = false;
+    await this.streamHeapSnapshot((chunk) => chunks.push(chunk), reportProgress);
+    return chunks.join("");
+  }
+
+  /**
+   * Capture a heap snapshot straight to disk as chunks arrive, so the full
+   * JSON text is never held in memory.
+   */
+  async takeHeapSnapshotToFile(outputPath: string, reportProgress = false): Promise<void> {
+    const file = await Deno.open(outputPath, { write: true, create: true, truncate: true });
+    const encoder = new TextEncoder();
+
+    // Chunk events arrive synchronously; buffer them into large writes and
+    // chain those to keep them in order. The chain never rejects: the first
+    // write error is kept, later chunks are dropped, and it is rethrown once
+    // the stream is done.
+    let writes = Promise.resolve();
+    let writeError: Error | undefined;
+    let pending: string[] = [];
+    let pendingLength = 0;
+    const flush = () => {
+      if (pending.length === 0) return;
+      const bytes = encoder.encode(pending.join(""));
+      pending = [];
+      pendingLength = 0;
+      writes = writes.then(async () => {
+        if (writeError) return;
+        let offset = 0;
+        while (offset < bytes.length) {
+          offset += await file.write(bytes.subarray(offset));
+        }
+      }).catch((err) => {
+        writeError ??= err;
+      });
+    };
+    const writeChunk = (chunk: string) => {
+      if (writeError) return;
+      pending.push(chunk);
+      pendingLength += chunk.length;
+      if (pendingLength >= HEAP_WRITE_BATCH_CHARS) {
+        flush();
+      }
+    };
 
+    try {
+      await this.streamHeapSnapshot(writeChunk, reportProgress);
+    } finally {
+      try {
+        flush();
+        await writes;
+      } finally {
+        file.close();
+      }
+    }
+    if (writeError) {
+      throw writeError;
+    }
+  }
+
+  /**
+   * Run HeapProfiler.takeHeapSnapshot, handing each chunk to onChunk.
+   */
+  private async streamHeapSnapshot(
+    onChunk: (chunk: string) => void,
+    reportProgress: boolean,
+  ): Promise<void> {
     const chunkHandler = (params: Record<string, unknown>) => {
       if (params.chunk) {
-        chunks.push(params.chunk as string);
+        onChunk(params.chunk as string);
       }
     };
 
+    // Progress events fire per batch of nodes; log at doubling thresholds so
+    // output stays O(log n) and never leans on an exact modulo hit
+    let nextProgressLog = HEAP_PROGRESS_FIRST_LOG;
     const progressHandler = (params: Record<string, unknown>) => {
       const done = params.done as number || 0;
-      const total = params.total as number || 0;
 
-      // Print progress if requested
-      if (reportProgress && done % 20000 === 0) {
+      if (done >= nextProgressLog || params.finished) {
+        const total = params.total as number || 0;
         console.log(`  Heap snapshot progress: ${done.toLocaleString()}/${total.toLocaleString()}`);
-      }
-
-      // When finished is true, snapshot is complete
-      if (params.finished) {
-        progressDone = true;
+        while (nextProgressLog <= done) {
+          nextProgressLog *= 2;
+        }
       }
     };
 
-    // Register event handlers BEFORE enabling heap profiler
-    this.onEvent("HeapProfiler.addHeapSnapshotChunk", chunkHandler);
-
+    // Register event handlers BEFORE enabling heap profiler; they are removed
+    // even if enabling or the capture itself fails
+    const handlers: Record<string, EventHandler> = {
+      "HeapProfiler.addHeapSnapshotChunk": chunkHandler,
+    };
     if (reportProgress) {
-      this.onEvent("HeapProfiler.reportHeapSnapshotProgress", progressHandler);
+      handlers["HeapProfiler.reportHeapSnapshotProgress"] = progressHandler;
     }
 
-    // Now enable heap profiler
-    await this.enableHeapProfiler();
-
-    // Request snapshot
-    try {
-      // Start snapshot capture
-      const snapshotPromise = this.sendCommand("HeapProfiler.takeHeapSnapshot", {
-        reportProgress,
-      });
+    await this.withEventHandlers(handlers, async () => {
+      await this.enableHeapProfiler();
 
-      // Wait for completion
-      if (reportProgress) {
-        // Wait for progress indicator
-        let waited = 0;
-        while (!progressDone && waited < 30000) {
-          await new Promise((resolve) => setTimeout(resolve, 100));
-          waited += 100;
-        }
-      } else {
-        // Wait a bit for chunks to arrive
-        await new Promise((resolve) => setTimeout(resolve, 5000));
+      try {
+        // V8 emits every chunk before it answers the command, and the socket
+        // delivers in order, so the response itself marks the end of the stream
+        await this.sendCommand("HeapProfiler.takeHeapSnapshot", { reportProgress });
+      } catch (err) {
+        // Continue even if command times out - we have the chunks
+        console.error("Snapshot capture error (may be OK):", err);
       }
-
-      // Wait for command completion
-      await snapshotPromise;
-    } catch (err) {
-      // Continue even if command times out - we have the chunks
-      console.error("Snapshot capture error (may be OK):", err);
-    }
-
-    return chunks.join("");
+    });
   }
 
   // ============================================================================
@@ -436,8 +641,8 @@ export class CDPClient {
   }
 
   async startProfiling(): Promise<void> {
-    await this.enableProfiler();
-    await this.sendCommand("Profiler.start");
+    // CDP handles commands in order, so start can follow enable without waiting
+    await this.sendCommands([["Profiler.enable"], ["Profiler.start"]]);
   }
 
   async stopProfiling(): Promise<CPUProfileData> {
@@ -450,6 +655,13 @@ export class CDPClient {
       this.ws.close();
       this.ws = null;
     }
+
+    // Fail outstanding commands now rather than leaving their timeouts running
+    for (const pending of this.pendingRequests.values()) {
+      clearTimeout(pending.timer);
+      pending.reject(new Error("WebSocket closed"));
+    }
+    this.pendingRequests.clear();
   }
 }
 
@@ -479,9 +691,8 @@ if (import.meta.main) {
   console.log("// Evaluate expression");
   console.log("const result = await client.evaluate('myVariable', frames[0].callFrameId);");
   console.log();
-  console.log("// Take heap snapshot");
-  console.log("const snapshot = await client.takeHeapSnapshot();");
-  console.log("await Deno.writeTextFile('snapshot.heapsnapshot', snapshot);");
+  console.log("// Take heap snapshot (streamed to disk chunk by chunk)");
+  console.log("await client.takeHeapSnapshotToFile('snapshot.heapsnapshot');");
   console.log();
   console.log("// CPU profiling");
   console.log("await client.startProfiling();");
@@ -0,0 +1,355 @@
+/**
+ * Tests for the CDP client against an in-process fake inspector
+ */
+
+import { assertEquals, assertRejects } from "https://deno.land/std@0.224.0/assert/mod.ts";
+import { CDPClient } from "./cdp_client.ts";
+
+type Reply = (
+  params: Record<string, unknown> | undefined,
+  emit: (method: string, params?: Record<string, unknown>) => void,
+) => Record<string, unknown> | Error | Promise<Record<string, unknown>>;
+
+interface FakeInspector {
+  port: number;
+  /** Every command received, in order */
+  received: Array<{ id: number; method: string; params?: Record<string, unknown> }>;
+  close(): Promise<void>;
+}
+
+/** Serve /json plus a WebSocket endpoint that answers each method via `replies` */
+function startFakeInspector(replies: Record<string, Reply> = {}): FakeInspector {
+  const received: FakeInspector["received"] = [];
+  const sockets: WebSocket[] = [];
+
+  const server: Deno.HttpServer<Deno.NetAddr> = Deno.serve({
+    hostname: "127.0.0.1",
+    port: 0,
+    onListen() {},
+  }, (req) => {
+    if (req.headers.get("upgrade") !== "websocket") {
+      return Response.json([{
+        description: "deno",
+        title: "Deno[1234]",
+        webSocketDebuggerUrl: `ws://127.0.0.1:${server.addr.port}/ws`,
+      }]);
+    }
+
+    const { socket, response } = Deno.upgradeWebSocket(req);
+    sockets.push(socket);
+    socket.onmessage = async (event) => {
+      const message = JSON.parse(event.data as string);
+      received.push(message);
+      if (message.method === "Runtime.runIfWaitingForDebugger") {
+        // Answer as a binary frame to exercise the client's decode path
+        socket.send(new TextEncoder().encode(JSON.stringify({ id: message.id, result: {} })));
+        return;
+      }
+      const emit = (method: string, params?: Record<string, unknown>) =>
+        socket.send(JSON.stringify({ method, params }));
+      const result = await (replies[message.method] ?? (() => ({})))(message.params, emit);
+      socket.send(JSON.stringify(
+        result instanceof Error
+          ? { id: message.id, error: { code: -32000, message: result.message } }
+          : { id: message.id, result },
+      ));
+    };
+    return response;
+  });
+
+  return {
+    port: server.addr.port,
+    received,
+    async close() {
+      for (const socket of sockets) {
+        socket.close();
+      }
+      await server.shutdown();
+    },
+  };
+}
+
+async function withClient(
+  replies: Record<string, Reply>,
+  fn: (client: CDPClient, inspector: FakeInspector) => Promise<void>,
+): Promise<void> {
+  const inspector = startFakeInspector(replies);
+  const client = new CDPClient("127.0.0.1", inspector.port);
+  try {
+    await client.connect();
+    await fn(client, inspector);
+  } finally {
+    client.close();
+    await inspector.close();
+  }
+}
+
+Deno.test("CDPClient - sendCommand resolves results and rejects protocol errors", async () => {
+  await withClient({
+    "Runtime.evaluate": (params) => ({ result: { type: "number", value: params?.expression } }),
+    "Debugger.pause": () => new Error("Not allowed"),
+  }, async (client, inspector) => {
+    assertEquals(client.runtimeInfo?.isDeno, true);
+    assertEquals(client.runtimeInfo?.isNode, false);
+    assertEquals(client.runtimeInfo?.title, "Deno[1234]");
+    assertEquals(await client.evaluate("1 + 1"), { type: "number", value: "1 + 1" });
+    await assertRejects(() => client.pause(), Error, "Not allowed");
+    assertEquals(inspector.received.map((m) => m.method), ["Runtime.evaluate", "Debugger.pause"]);
+    // Param-less commands carry no params key
+    assertEquals(inspector.received, [
+      { id: 1, method: "Runtime.evaluate", params: { expression: "1 + 1" } },
+      { id: 2, method: "Debugger.pause" },
+    ]);
+  });
+});
+
+Deno.test("CDPClient - close rejects commands still waiting for a response", async () => {
+  const inspector = startFakeInspector();
+  const client = new CDPClient("127.0.0.1", inspector.port);
+  try {
+    await client.connect();
+    // Queue a command and close before its response can be processed
+    const pending = client.sendCommand("Debugger.resume");
+    client.close();
+    await assertRejects(() => pending, Error, "WebSocket closed");
+  } finally {
+    await inspector.close();
+  }
+});
+
+Deno.test("CDPClient - sendCommand cleans up when the send itself throws", async () => {
+  await withClient({}, async (client) => {
+    // Reach into the client to fail the send, as a close racing the
+    // readyState check would
+    const internals = client as unknown as { ws: WebSocket; pendingRequests: Map<number, unknown> };
+    const ws = internals.ws;
+    const send = ws.send;
+    ws.send = () => {
+      throw new DOMException("socket closed", "InvalidStateError");
+    };
+    await assertRejects(() => client.sendCommand("Debugger.resume"), DOMException, "socket closed");
+    // No pending entry (or its timeout) is left behind
+    assertEquals(internals.pendingRequests.size, 0);
+    ws.send = send;
+    assertEquals(await client.sendCommand("Runtime.runIfWaitingForDebugger"), {});
+  });
+});
+
+Deno.test("CDPClient - sendCommands and getScopeVariables pipeline requests", async () => {
+  const scopes: Record<string, Array<Record<string, unknown>>> = {
+    local: [{ name: "x", value: { type: "number", value: 1 } }],
+    closure: [{ name: "x", value: { type: "number", value: 2 } }, { name: "y", value: {} }],
+  };
+  await withClient({
+    "Debugger.pause": (_params, emit) => {
+      emit("Debugger.paused", {
+        callFrames: [{
+          callFrameId: "frame-0",
+          scopeChain: [
+            { type: "local", object: { type: "object", objectId: "local" } },
+            { type: "global", object: { type: "object" } },
+            { type: "closure", object: { type: "object", objectId: "closure" } },
+          ],
+        }],
+      });
+      return {};
+    },
+    "Runtime.getProperties": (params) => ({ result: scopes[params?.objectId as string] }),
+  }, async (client, inspector) => {
+    await client.enableDebugger();
+    assertEquals(inspector.received.map((m) => m.method), ["Debugger.enable", "Runtime.enable"]);
+
+    await client.pause();
+    assertEquals(client.getCallFrame("frame-0")?.scopeChain.length, 3);
+    assertEquals(client.getCallFrame("frame-1"), undefined);
+    // Later scopes in the chain win, matching the sequential lookup
+    assertEquals(await client.getScopeVariables("frame-0"), {
+      x: { type: "number", value: 2 },
+      y: {},
+    });
+    assertEquals(inspector.received.map((m) => m.method).slice(-2), [
+      "Runtime.getProperties",
+      "Runtime.getProperties",
+    ]);
+  });
+});
+
+Deno.test("CDPClient - accepts responses sent as binary frames", async () => {
+  await withClient({}, async (client) => {
+    assertEquals(await client.sendCommand("Runtime.runIfWaitingForDebugger"), {});
+  });
+});
+
+const SNAPSHOT_CHUNKS = ['{"nodes":', "[1,2,3]", "}"];
+
+const snapshotReplies: Record<string, Reply> = {
+  "HeapProfiler.takeHeapSnapshot": (_params, emit) => {
+    for (const chunk of SNAPSHOT_CHUNKS) {
+      emit("HeapProfiler.addHeapSnapshotChunk", { chunk });
+    }
+    return {};
+  },
+};
+
+Deno.test("CDPClient - takeHeapSnapshot collects chunks up to the command response", async () => {
+  await withClient(snapshotReplies, async (client) => {
+    const start = performance.now();
+    assertEquals(await client.takeHeapSnapshot(), '{"nodes":[1,2,3]}');
+    // No fixed settle delay once the response has arrived
+    assertEquals(performance.now() - start < 1000, true);
+  });
+});
+
+Deno.test("CDPClient - handlers can remove themselves without skipping the next one", async () => {
+  await withClient({
+    "Debugger.pause": (_params, emit) => {
+      emit("Debugger.paused", { callFrames: [] });
+      return {};
+    },
+  }, async (client) => {
+    const calls: string[] = [];
+    const once = () => {
+      calls.push("once");
+      client.offEvent("Debugger.paused", once);
+    };
+    client.onEvent("Debugger.paused", once);
+    client.onEvent("Debugger.paused", () => {
+      calls.push("always");
+    });
+
+    await client.pause();
+    await client.pause();
+    assertEquals(calls, ["once", "always", "always"]);
+  });
+});
+
+Deno.test("CDPClient - each onEvent registration is removed on its own", async () => {
+  await withClient({
+    "Debugger.pause": (_params, emit) => {
+      emit("Debugger.paused", { callFrames: [] });
+      return {};
+    },
+  }, async (client) => {
+    let seen = 0;
+    const handler = () => void seen++;
+    const first = client.onEvent("Debugger.paused", handler);
+    client.onEvent("Debugger.paused", handler);
+    client.onEvent("Debugger.paused", handler);
+
+    await client.pause();
+    assertEquals(seen, 3);
+
+    first();
+    first(); // Disposing twice does not touch the other registrations
+    await client.pause();
+    assertEquals(seen, 5);
+
+    client.offEvent("Debugger.paused", handler);
+    await client.pause();
+    assertEquals(seen, 6);
+  });
+});
+
+Deno.test("CDPClient - takeHeapSnapshotToFile writes buffered chunks to disk", async () => {
+  const dir = await Deno.makeTempDir();
+  try {
+    await withClient(snapshotReplies, async (client) => {
+      const path = `${dir}/snap.heapsnapshot`;
+      await client.takeHeapSnapshotToFile(path);
+      assertEquals(await Deno.readTextFile(path), SNAPSHOT_CHUNKS.join(""));
+    });
+  } finally {
+    await Deno.remove(dir, { recursive: true });
+  }
+});
+
+Deno.test("CDPClient - takeHeapSnapshotToFile rejects when a batched write fails", async () => {
+  const dir = await Deno.makeTempDir();
+  const realOpen = Deno.open;
+  let writes = 0;
+  // Hand out a real file whose writes fail, as on a full disk
+  Deno.open = async (...args: Parameters<typeof Deno.open>) => {
+    const file = await realOpen(...args);
+    file.write = () => {
+      writes++;
+      return Promise.reject(new Error("No space left on device"));
+    };
+    return file;
+  };
+
+  // Each chunk fills a write batch, so the first write fails while the rest
+  // of the snapshot is still streaming
+  const big = "x".repeat(1024 * 1024);
+  try {
+    await withClient({
+      "HeapProfiler.takeHeapSnapshot": async (_params, emit) => {
+        for (const chunk of [big, big, big]) {
+          emit("HeapProfiler.addHeapSnapshotChunk", { chunk });
+        }
+        // Hold the response so the failed write sits across event-loop turns
+        await new Promise((resolve) => setTimeout(resolve, 200));
+        return {};
+      },
+    }, async (client) => {
+      await assertRejects(
+        () => client.takeHeapSnapshotToFile(`${dir}/snap.heapsnapshot`),
+        Error,
+        "No space left on device",
+      );
+      // No further writes are queued after the first failure
+      assertEquals(writes, 1);
+      // The process survived and the client is still usable
+      assertEquals(await client.sendCommand("Runtime.runIfWaitingForDebugger"), {});
+    });
+  } finally {
+    Deno.open = realOpen;
+    await Deno.remove(dir, { recursive: true });
+  }
+});
+
+Deno.test("CDPClient - stepOverN waits for a pause after every step", async () => {
+  let line = 0;
+  const pausedAt = (emit: (method: string, params?: Record<string, unknown>) => void) => {
+    emit("Debugger.resumed");
+    emit("Debugger.paused", {
+      callFrames: [{ callFrameId: `frame-${++line}`, scopeChain: [] }],
+    });
+    return {};
+  };
+  await withClient({
+    "Debugger.stepOver": (_params, emit) => pausedAt(emit),
+  }, async (client, inspector) => {
+    const frames = await client.stepOverN(3);
+    assertEquals(frames[0].callFrameId, "frame-3");
+    assertEquals(inspector.received.filter((m) => m.method === "Debugger.stepOver").length, 3);
+
+    await assertRejects(() => client.waitForPaused(10), Error, "Debugger.paused");
+  });
+});
+
+Deno.test("CDPClient - withEventHandlers removes handlers when the body throws", async () => {
+  await withClient({
+    "Debugger.pause": (_params, emit) => {
+      emit("Debugger.paused", { callFrames: [] });
+      return {};
+    },
+  }, async (client) => {
+    let seen = 0;
+    await assertRejects(
+      () =>
+        client.withEventHandlers({ "Debugger.paused": () => void seen++ }, async () => {
+          await client.pause();
+          throw new Error("boom");
+        }),
+      Error,
+      "boom",
+    );
+    await client.pause();
+    assertEquals(seen, 1);
+
+    const dispose = client.onEvent("Debugger.paused", () => void seen++);
+    dispose();
+    await client.pause();
+    assertEquals(seen, 1);
+  });
+});
@@ -36,6 +36,8 @@ export interface RaceAnalysis {
   raceEvidence: string[];
 }
 
+const RACE_RULE = "=".repeat(60);
+
 /**
  * Generate concurrent HTTP requests to trigger race conditions
  *
@@ -205,24 +207,27 @@ export function analyzeForRace(
  * Pretty-print race analysis results
  */
 export function printRaceAnalysis(analysis: RaceAnalysis): void {
-  console.log("\n" + "=".repeat(60));
-  console.log("RACE CONDITION ANALYSIS");
-  console.log("=".repeat(60));
-  console.log(`Total requests:      ${analysis.totalRequests}`);
-  console.log(`Successful:          ${analysis.successfulRequests}`);
-  console.log(`Failed:              ${analysis.failedRequests}`);
-  console.log(`Average duration:    ${analysis.averageDuration.toFixed(1)}ms`);
-  console.log(`Duration range:      ${analysis.minDuration}-${analysis.maxDuration}ms`);
-  console.log("");
-  console.log(`Race detected:       ${analysis.raceDetected ? "❌ YES" : "✅ NO"}`);
+  // Collect the report and print it in one write instead of one per line
+  const out: string[] = [];
+  out.push("\n" + RACE_RULE);
+  out.push("RACE CONDITION ANALYSIS");
+  out.push(RACE_RULE);
+  out.push(`Total requests:      ${analysis.totalRequests}`);
+  out.push(`Successful:          ${analysis.successfulRequests}`);
+  out.push(`Failed:              ${analysis.failedRequests}`);
+  out.push(`Average duration:    ${analysis.averageDuration.toFixed(1)}ms`);
+  out.push(`Duration range:      ${analysis.minDuration}-${analysis.maxDuration}ms`);
+  out.push("");
+  out.push(`Race detected:       ${analysis.raceDetected ? "❌ YES" : "✅ NO"}`);
 
   if (analysis.raceEvidence.length > 0) {
-    console.log("\nEvidence:");
+    out.push("\nEvidence:");
     for (const evidence of analysis.raceEvidence) {
-      console.log(`  - ${evidence}`);
+      out.push(`  - ${evidence}`);
     }
   }
-  console.log("=".repeat(60));
+  out.push(RACE_RULE);
+  console.log(out.join("\n"));
 }
 
 // ============================================================================
@@ -91,6 +91,7 @@ export class CPUProfile {
   public totalSamples: number = 0;
   public sampleCounts: Map<number, number>;
   public inclusiveSamples: Map<number, number>;
+  private callPaths = new Map<number, string>();
 
   constructor(profileData: CPUProfileData) {
     this.rawData = profileData;
@@ -116,14 +117,21 @@ export class CPUProfile {
 
   private buildCallTree(): void {
     for (const node of this.nodes) {
-      for (const childId of node.children || []) {
-        // Track children
-        if (!this.childrenMap.has(node.id)) {
-          this.childrenMap.set(node.id, []);
-        }
-        this.childrenMap.get(node.id)!.push(childId);
+      const children = node.children;
+      if (!children || children.length === 0) {
+        continue;
+      }
 
-        // Track parent
+      // Track children, sharing the profile's own array rather than copying it
+      const existing = this.childrenMap.get(node.id);
+      if (existing) {
+        this.childrenMap.set(node.id, existing.concat(children));
+      } else {
+        this.childrenMap.set(node.id, children);
+      }
+
+      // Track parent
+      for (const childId of children) {
         this.parentMap.set(childId, node.id);
       }
     }
@@ -137,73 +145,146 @@ export class CPUProfile {
       this.sampleCounts.set(sample, (this.sampleCounts.get(sample) || 0) + 1);
     }
 
-    // Calculate inclusive samples (including children)
+    // Calculate inclusive samples (including children) bottom-up in one pass.
+    // Breadth-first order from the roots puts every node after the node that
+    // discovered it, so walking it backwards folds children before parents.
+    const order: number[] = [];
+    const discoveredBy: number[] = [];
+    const seen = new Set<number>();
+    for (const node of this.nodes) {
+      if (!this.parentMap.has(node.id)) {
+        order.push(node.id);
+        discoveredBy.push(-1);
+        seen.add(node.id);
+      }
+    }
+    for (let i = 0; i < order.length; i++) {
+      for (const childId of this.childrenMap.get(order[i]) || []) {
+        if (!seen.has(childId)) {
+          seen.add(childId);
+          order.push(childId);
+          discoveredBy.push(i);
+        }
+      }
+    }
+
+    const inclusive = new Float64Array(order.length);
+    for (let i = 0; i < order.length; i++) {
+      inclusive[i] = this.sampleCounts.get(order[i]) || 0;
+    }
+    for (let i = order.length - 1; i > 0; i--) {
+      if (discoveredBy[i] >= 0) {
+        inclusive[discoveredBy[i]] += inclusive[i];
+      }
+    }
+
+    const inclusiveById = new Map<number, number>();
+    for (let i = 0; i < order.length; i++) {
+      inclusiveById.set(order[i], inclusive[i]);
+    }
     for (const node of this.nodes) {
-      this.inclusiveSamples.set(node.id, this.getInclusiveSamples(node.id, new Set()));
+      // Nodes only reachable through a cycle have no root to hang from
+      this.inclusiveSamples.set(
+        node.id,
+        inclusiveById.get(node.id) ?? (this.sampleCounts.get(node.id) || 0),
+      );
     }
   }
 
-  private getInclusiveSamples(nodeId: number, visited: Set<number>): number {
-    if (visited.has(nodeId)) {
-      return 0;
+  /**
+   * Root-to-node call path ("fn:line -> fn:line"), memoized so hot nodes
+   * sharing ancestors reuse the ancestors' paths
+   */
+  getCallPath(nodeId: number): string {
+    const cached = this.callPaths.get(nodeId);
+    if (cached !== undefined) {
+      return cached;
     }
-    visited.add(nodeId);
 
-    let count = this.sampleCounts.get(nodeId) || 0;
+    // Climb to the first ancestor with a known path, then build back down
+    const chain: number[] = [];
+    let path = "";
+    let currentId: number | undefined = nodeId;
+    while (currentId !== undefined) {
+      const known = this.callPaths.get(currentId);
+      if (known !== undefined) {
+        path = known;
+        break;
+      }
+      chain.push(currentId);
+      currentId = this.parentMap.get(currentId);
+    }
 
-    for (const childId of this.childrenMap.get(nodeId) || []) {
-      count += this.getInclusiveSamples(childId, visited);
+    for (let i = chain.length - 1; i >= 0; i--) {
+      const node = this.nodeById.get(chain[i]);
+      if (node) {
+        const frame = `${node.callFrame.functionName}:${node.callFrame.lineNumber}`;
+        path = path ? `${path} -> ${frame}` : frame;
+      }
+      this.callPaths.set(chain[i], path);
     }
 
-    return count;
+    return path;
   }
 
-  getHotFunctions(limit = 20): HotFunction[] {
-    const data: HotFunction[] = [];
-
-    for (const node of this.nodes) {
-      const selfSamples = node.hitCount || 0;
-      const totalSamples = this.inclusiveSamples.get(node.id) || 0;
+  /** Multiplier turning a sample count into a percentage of all samples */
+  getPctScale(): number {
+    return this.totalSamples > 0 ? 100 / this.totalSamples : 0;
+  }
 
-      if (selfSamples > 0 || totalSamples > 0) {
-        data.push({
-          functionName: node.callFrame.functionName || "(anonymous)",
-          url: node.callFrame.url,
-          line: node.callFrame.lineNumber,
-          selfSamples,
-          totalSamples,
-          selfPct: this.totalSamples > 0 ? (selfSamples / this.totalSamples * 100) : 0,
-          totalPct: this.totalSamples > 0 ? (totalSamples / this.totalSamples * 100) : 0,
-          bailoutReason: node.deoptReason,
-          deoptReason: node.deoptReason,
-        });
+  getHotFunctions(limit = 20): HotFunction[] {
+    const pctScale = this.getPctScale();
+
+    // Rank node indexes on plain numbers; only the kept rows become objects
+    const totals = new Float64Array(this.nodes.length);
+    const candidates: number[] = [];
+    for (let i = 0; i < this.nodes.length; i++) {
+      const node = this.nodes[i];
+      totals[i] = this.inclusiveSamples.get(node.id) || 0;
+      if ((node.hitCount || 0) > 0 || totals[i] > 0) {
+        candidates.push(i);
       }
     }
+    candidates.sort((a, b) => totals[b] - totals[a]);
 
-    return data.sort((a, b) => b.totalSamples - a.totalSamples).slice(0, limit);
+    return candidates.slice(0, limit).map((i) => {
+      const node = this.nodes[i];
+      const selfSamples = node.hitCount || 0;
+      return {
+        functionName: node.callFrame.functionName || "(anonymous)",
+        url: node.callFrame.url,
+        line: node.callFrame.lineNumber,
+        selfSamples,
+        totalSamples: totals[i],
+        selfPct: selfSamples * pctScale,
+        totalPct: totals[i] * pctScale,
+        bailoutReason: node.deoptReason,
+        deoptReason: node.deoptReason,
+      };
+    });
   }
 
   getCallTree(rootId?: number, maxDepth = 10): CallTreeNode[] {
     if (rootId === undefined) {
-      // Find root node (node with no parent)
-      const rootCandidates = this.nodes.filter((n) => !this.parentMap.has(n.id));
-      if (rootCandidates.length === 0) {
+      // Find root node (node with no parent); V8 lists it first, so stop at the first hit
+      const rootNode = this.nodes.find((n) => !this.parentMap.has(n.id));
+      if (!rootNode) {
         return [];
       }
-      rootId = rootCandidates[0].id;
+      rootId = rootNode.id;
     }
 
-    const buildTree = (nodeId: number, depth: number): CallTreeNode | null => {
-      if (depth > maxDepth) {
-        return null;
-      }
+    if (maxDepth < 0) {
+      return [];
+    }
 
+    const makeTreeNode = (nodeId: number): CallTreeNode | null => {
       const node = this.nodeById.get(nodeId);
       if (!node) {
         return null;
       }
 
-      const treeNode: CallTreeNode = {
+      return {
         function: node.callFrame.functionName || "(anonymous)",
         url: node.callFrame.url,
         line: node.callFrame.lineNumber,
@@ -211,19 +292,35 @@ export class CPUProfile {
         totalSamples: this.inclusiveSamples.get(nodeId) || 0,
         children: [],
       };
+    };
+
+    const root = makeTreeNode(rootId);
+    if (!root) {
+      return [];
+    }
+
+    // Explicit stack instead of recursion, so deep profiles cannot overflow
+    // the call stack; children are attached in profile order as each parent
+    // is expanded
+    const stack: Array<[nodeId: number, treeNode: CallTreeNode, depth: number]> = [
+      [rootId, root, 0],
+    ];
+    while (stack.length > 0) {
+      const [nodeId, treeNode, depth] = stack.pop()!;
+      if (depth >= maxDepth) {
+        continue;
+      }
 
       for (const childId of this.childrenMap.get(nodeId) || []) {
-        const childTree = buildTree(childId, depth + 1);
+        const childTree = makeTreeNode(childId);
         if (childTree) {
           treeNode.children.push(childTree);
+          stack.push([childId, childTree, depth + 1]);
         }
       }
+    }
 
-      return treeNode;
-    };
-
-    const tree = buildTree(rootId, 0);
-    return tree ? [tree] : [];
+    return [root];
   }
 
   detectOptimizationIssues(): OptimizationIssue[] {
@@ -281,7 +378,9 @@ export async function stopProfiling(
   console.log("CPU profiling stopped");
 
   if (outputPath) {
-    await Deno.writeTextFile(outputPath, JSON.stringify(profileData, null, 2));
+    // Compact, like DevTools' own .cpuprofile files; indenting only adds
+    // bytes and formatting time for a file read by tools
+    await Deno.writeTextFile(outputPath, JSON.stringify(profileData));
     console.log(`Profile saved to ${outputPath}`);
   }
 
@@ -290,23 +389,14 @@ export async function stopProfiling(
 
 export function analyzeHotPaths(profile: CPUProfile, minPct = 1.0): HotPath[] {
   const hotNodes: HotPath[] = [];
+  const pctScale = profile.getPctScale();
 
   for (const node of profile.nodes) {
     const totalSamples = profile.inclusiveSamples.get(node.id) || 0;
-    const pct = profile.totalSamples > 0 ? (totalSamples / profile.totalSamples * 100) : 0;
+    const pct = totalSamples * pctScale;
 
     if (pct >= minPct) {
-      // Build path from root to this node
-      const path: string[] = [];
-      let currentId: number | undefined = node.id;
-
-      while (currentId !== undefined) {
-        const currentNode = profile.nodeById.get(currentId);
-        if (currentNode) {
-          path.unshift(`${currentNode.callFrame.functionName}:${currentNode.callFrame.lineNumber}`);
-        }
-        currentId = profile.parentMap.get(currentId);
-      }
+      const callPath = profile.getCallPath(node.id);
 
       hotNodes.push({
         function: node.callFrame.functionName || "(anonymous)",
@@ -314,7 +404,7 @@ export function analyzeHotPaths(profile: CPUProfile, minPct = 1.0): HotPath[] {
         line: node.callFrame.lineNumber,
         pct,
         samples: totalSamples,
-        callPath: path.length > 0 ? path.join(" -> ") : node.callFrame.functionName,
+        callPath: callPath || node.callFrame.functionName,
       });
     }
   }
@@ -323,32 +413,32 @@ export function analyzeHotPaths(profile: CPUProfile, minPct = 1.0): HotPath[] {
 }
 
 export function detectAsyncIssues(profile: CPUProfile): AsyncAnalysis {
-  // Look for common async patterns
-  const promiseNodes = profile.nodes.filter((n) =>
-    n.callFrame.functionName.includes("Promise") ||
-    n.callFrame.url.toLowerCase().includes("async")
-  );
-
-  const awaitNodes = profile.nodes.filter((n) =>
-    n.callFrame.functionName.toLowerCase().includes("await")
-  );
-
-  const callbackNodes = profile.nodes.filter((n) =>
-    n.callFrame.functionName.toLowerCase().includes("callback")
-  );
-
-  const promiseSamples = promiseNodes.reduce(
-    (sum, n) => sum + (profile.inclusiveSamples.get(n.id) || 0),
-    0,
-  );
-  const awaitSamples = awaitNodes.reduce(
-    (sum, n) => sum + (profile.inclusiveSamples.get(n.id) || 0),
-    0,
-  );
-  const callbackSamples = callbackNodes.reduce(
-    (sum, n) => sum + (profile.inclusiveSamples.get(n.id) || 0),
-    0,
-  );
+  // Look for common async patterns in a single pass over the nodes
+  let promiseNodeCount = 0;
+  let awaitNodeCount = 0;
+  let callbackNodeCount = 0;
+  let promiseSamples = 0;
+  let awaitSamples = 0;
+  let callbackSamples = 0;
+
+  for (const n of profile.nodes) {
+    const functionName = n.callFrame.functionName;
+    const lowerName = functionName.toLowerCase();
+    const samples = profile.inclusiveSamples.get(n.id) || 0;
+
+    if (functionName.includes("Promise") || n.callFrame.url.toLowerCase().includes("async")) {
+      promiseNodeCount++;
+      promiseSamples += samples;
+    }
+    if (lowerName.includes("await")) {
+      awaitNodeCount++;
+      awaitSamples += samples;
+    }
+    if (lowerName.includes("callback")) {
+      callbackNodeCount++;
+      callbackSamples += samples;
+    }
+  }
 
   const total = profile.totalSamples;
 
@@ -356,9 +446,9 @@ export function detectAsyncIssues(profile: CPUProfile): AsyncAnalysis {
     promiseRelatedPct: total > 0 ? (promiseSamples / total * 100) : 0,
     awaitRelatedPct: total > 0 ? (awaitSamples / total * 100) : 0,
     callbackRelatedPct: total > 0 ? (callbackSamples / total * 100) : 0,
-    promiseNodeCount: promiseNodes.length,
-    awaitNodeCount: awaitNodes.length,
-    callbackNodeCount: callbackNodes.length,
+    promiseNodeCount,
+    awaitNodeCount,
+    callbackNodeCount,
     analysis: interpretAsyncMetrics(promiseSamples, awaitSamples, callbackSamples, total),
   };
 }
@@ -403,6 +493,7 @@ function interpretAsyncMetrics(
 
 export function getFunctionTimes(profile: CPUProfile, urlFilter?: string): FunctionTimes[] {
   const data: FunctionTimes[] = [];
+  const pctScale = profile.getPctScale();
 
   for (const node of profile.nodes) {
     if (urlFilter && !node.callFrame.url.includes(urlFilter)) {
@@ -417,8 +508,8 @@ export function getFunctionTimes(profile: CPUProfile, urlFilter?: string): Funct
         function: node.callFrame.functionName || "(anonymous)",
         url: node.callFrame.url,
         line: node.callFrame.lineNumber,
-        selfTimePct: profile.totalSamples > 0 ? (selfSamples / profile.totalSamples * 100) : 0,
-        totalTimePct: profile.totalSamples > 0 ? (totalSamples / profile.totalSamples * 100) : 0,
+        selfTimePct: selfSamples * pctScale,
+        totalTimePct: totalSamples * pctScale,
         selfSamples,
         totalSamples,
       });
@@ -483,49 +574,81 @@ export interface FlameGraphStack {
   children?: FlameGraphStack[];
 }
 
+/**
+ * Collapsed stacks per profile. Everything they derive from (sampleCounts,
+ * parentMap) is fixed at construction, so a profile's output never changes.
+ */
+const FLAME_GRAPHS = new WeakMap<CPUProfile, string>();
+
 /**
  * Convert CPU profile to flamegraph format (for visualization tools)
  * Output can be used with speedscope, flamegraph.pl, or d3-flame-graph
  */
 export function generateFlameGraph(profile: CPUProfile): string {
-  const stacks: string[] = [];
+  const cached = FLAME_GRAPHS.get(profile);
+  if (cached !== undefined) {
+    return cached;
+  }
 
-  // Build call stacks from samples
-  for (const sampleId of profile.samples) {
-    const stack: string[] = [];
-    let nodeId: number | undefined = sampleId;
+  // Every sample of the same leaf node has the same stack, so walk the tree
+  // once per distinct leaf (sampleCounts) instead of once per sample
+  const stackCounts = new Map<string, number>();
+  // Stack text per node; siblings reuse their parent's prefix, so each
+  // frame label is formatted once however many leaves sit under it
+  const stacks = new Map<number, string>();
+  for (const [sampleId, count] of profile.sampleCounts) {
+    const stack = flameStack(profile, sampleId, stacks);
+    if (stack) {
+      // Distinct nodes can still render to the same stack text
+      stackCounts.set(stack, (stackCounts.get(stack) || 0) + count);
+    }
+  }
 
-    // Walk up the call tree
-    while (nodeId !== undefined) {
-      const node = profile.nodeById.get(nodeId);
-      if (!node) break;
+  // Output in flamegraph collapsed format
+  let collapsed = "";
+  for (const [stack, count] of stackCounts) {
+    collapsed += collapsed ? `\n${stack} ${count}` : `${stack} ${count}`;
+  }
 
-      const funcName = node.callFrame.functionName || "(anonymous)";
-      const url = node.callFrame.url.replace(/^file:\/\//, "").split("/").pop() || "";
-      const line = node.callFrame.lineNumber;
+  FLAME_GRAPHS.set(profile, collapsed);
+  return collapsed;
+}
 
-      stack.unshift(`${funcName} (${url}:${line})`);
-      nodeId = profile.parentMap.get(nodeId);
-    }
+/** Collapsed-stack frame label: "fn (file.ts:line)" */
+function flameFrameLabel(node: CPUProfileNode): string {
+  const funcName = node.callFrame.functionName || "(anonymous)";
+  // Basename of the script URL, without splitting the whole path up
+  const url = node.callFrame.url;
+  const file = url.slice(url.lastIndexOf("/") + 1);
+  return `${funcName} (${file}:${node.callFrame.lineNumber})`;
+}
 
-    if (stack.length > 0) {
-      stacks.push(stack.join(";"));
+/**
+ * Root-to-node stack ("a;b;c"), memoized in `stacks`. Climbs to the first
+ * ancestor already rendered, then extends its text back down.
+ */
+function flameStack(profile: CPUProfile, nodeId: number, stacks: Map<number, string>): string {
+  const chain: CPUProfileNode[] = [];
+  let stack = "";
+  let currentId: number | undefined = nodeId;
+  while (currentId !== undefined) {
+    const known = stacks.get(currentId);
+    if (known !== undefined) {
+      stack = known;
+      break;
     }
+    const node = profile.nodeById.get(currentId);
+    if (!node) break;
+    chain.push(node);
+    currentId = profile.parentMap.get(currentId);
   }
 
-  // Count occurrences of each unique stack
-  const stackCounts = new Map<string, number>();
-  for (const stack of stacks) {
-    stackCounts.set(stack, (stackCounts.get(stack) || 0) + 1);
+  for (let i = chain.length - 1; i >= 0; i--) {
+    const label = flameFrameLabel(chain[i]);
+    stack = stack ? `${stack};${label}` : label;
+    stacks.set(chain[i].id, stack);
   }
-
-  // Output in flamegraph collapsed format
-  const lines: string[] = [];
-  for (const [stack, count] of stackCounts.entries()) {
-    lines.push(`${stack} ${count}`);
-  }
-
-  return lines.join("\n");
+  return stack;
 }
 
 /**
@@ -587,6 +710,40 @@ export interface ComplexityIssue {
   severity: "critical" | "warning" | "info";
 }
 
+const COMPLEXITY_RULE = "=".repeat(70);
+
+const COMPLEXITY_ICONS: Readonly<Record<ComplexityIssue["severity"], string>> = {
+  critical: "🔴",
+  warning: "⚠️",
+  info: "ℹ️",
+};
+
+/** Lowercase name fragments suggesting a function iterates over its input */
+const ITERATION_KEYWORDS: readonly string[] = [
+  "loop",
+  "iterate",
+  "each",
+  "map",
+  "filter",
+  "reduce",
+  "compare",
+  "check",
+];
+
+/** Lowercase name fragments common to functions that turn quadratic */
+const QUADRATIC_PATTERNS: readonly string[] = [
+  "compare",
+  "checksum",
+  "validate",
+  "match",
+  "find",
+  "contains",
+  "indexof",
+  "search",
+  "sort",
+  "calc",
+];
+
 /**
  * Analyze CPU profile for algorithmic complexity issues
  * Detects likely O(n²), O(n³), or worse patterns
@@ -616,19 +773,7 @@ export function analyzeComplexity(profile: CPUProfile): ComplexityIssue[] {
 
     // Heuristic 2: Function name suggests iteration
     const funcName = func.functionName.toLowerCase();
-    const iterationKeywords = [
-      "loop",
-      "iterate",
-      "each",
-      "map",
-      "filter",
-      "reduce",
-      "compare",
-      "check",
-    ];
-    const matchedKeywords = iterationKeywords.filter((kw) => funcName.includes(kw));
-
-    if (matchedKeywords.length > 0) {
+    if (ITERATION_KEYWORDS.some((kw) => funcName.includes(kw))) {
       evidence.push(`Function name suggests iteration: "${func.functionName}"`);
     }
 
@@ -639,20 +784,7 @@ export function analyzeComplexity(profile: CPUProfile): ComplexityIssue[] {
     }
 
     // Heuristic 4: Common O(n²) function names
-    const quadraticPatterns = [
-      "compare",
-      "checksum",
-      "validate",
-      "match",
-      "find",
-      "contains",
-      "indexof",
-      "search",
-      "sort",
-      "calc",
-    ];
-
-    for (const pattern of quadraticPatterns) {
+    for (const pattern of QUADRATIC_PATTERNS) {
       if (funcName.includes(pattern) && func.selfPct > 20) {
         evidence.push(
           `Function name "${func.functionName}" with high CPU suggests nested iteration`,
@@ -688,56 +820,57 @@ export function printComplexityAnalysis(issues: ComplexityIssue[]): void {
     return;
   }
 
-  console.log("\n" + "=".repeat(70));
-  console.log("ALGORITHMIC COMPLEXITY ANALYSIS");
-  console.log("=".repeat(70));
+  // Collect the report and print it in one write instead of one per line
+  const out: string[] = [];
+  out.push("\n" + COMPLEXITY_RULE);
+  out.push("ALGORITHMIC COMPLEXITY ANALYSIS");
+  out.push(COMPLEXITY_RULE);
 
   for (const issue of issues) {
-    const icon = issue.severity === "critical" ? "🔴" : issue.severity === "warning" ? "⚠️" : "ℹ️";
-
-    console.log(`\n${icon} ${issue.functionName}`);
-    console.log(`   Location: ${issue.url}:${issue.line}`);
-    console.log(`   CPU Time: ${issue.selfTimePct.toFixed(1)}%`);
-    console.log(`   Suspected: ${issue.suspectedComplexity}`);
-    console.log(`   Evidence:`);
+    out.push(`\n${COMPLEXITY_ICONS[issue.severity]} ${issue.functionName}`);
+    out.push(`   Location: ${issue.url}:${issue.line}`);
+    out.push(`   CPU Time: ${issue.selfTimePct.toFixed(1)}%`);
+    out.push(`   Suspected: ${issue.suspectedComplexity}`);
+    out.push(`   Evidence:`);
 
     for (const ev of issue.evidence) {
-      console.log(`     • ${ev}`);
+      out.push(`     • ${ev}`);
     }
   }
 
-  console.log("\n" + "=".repeat(70));
-  console.log("RECOMMENDATIONS");
-  console.log("=".repeat(70));
+  out.push("\n" + COMPLEXITY_RULE);
+  out.push("RECOMMENDATIONS");
+  out.push(COMPLEXITY_RULE);
 
   const critical = issues.filter((i) => i.severity === "critical");
   if (critical.length > 0) {
-    console.log("\n🔴 Critical (investigate immediately):");
+    out.push("\n🔴 Critical (investigate immediately):");
     for (const issue of critical) {
-      console.log(`   • ${issue.functionName} - ${issue.suspectedComplexity}`);
-      console.log(`     ${issue.url}:${issue.line}`);
+      out.push(`   • ${issue.functionName} - ${issue.suspectedComplexity}`);
+      out.push(`     ${issue.url}:${issue.line}`);
     }
   }
 
   const warnings = issues.filter((i) => i.severity === "warning");
   if (warnings.length > 0) {
-    console.log("\n⚠️  Warnings (review for optimization):");
+    out.push("\n⚠️  Warnings (review for optimization):");
     for (const issue of warnings) {
-      console.log(`   • ${issue.functionName} - ${issue.suspectedComplexity}`);
+      out.push(`   • ${issue.functionName} - ${issue.suspectedComplexity}`);
     }
   }
 
-  console.log("\nCommon O(n²) patterns to look for:");
-  console.log("  • Nested loops over the same data");
-  console.log("  • Array.indexOf/includes inside loops");
-  console.log("  • Repeated linear searches");
-  console.log("  • Comparing every item with every other item");
-  console.log("\nSolutions:");
-  console.log("  • Use Maps/Sets for O(1) lookup instead of arrays");
-  console.log("  • Cache results instead of recomputing");
-  console.log("  • Use more efficient algorithms (sort + binary search, etc.)");
-  console.log("  • Break down processing into smaller chunks");
-  console.log("=".repeat(70));
+  out.push("\nCommon O(n²) patterns to look for:");
+  out.push("  • Nested loops over the same data");
+  out.push("  • Array.indexOf/includes inside loops");
+  out.push("  • Repeated linear searches");
+  out.push("  • Comparing every item with every other item");
+  out.push("\nSolutions:");
+  out.push("  • Use Maps/Sets for O(1) lookup instead of arrays");
+  out.push("  • Cache results instead of recomputing");
+  out.push("  • Use more efficient algorithms (sort + binary search, etc.)");
+  out.push("  • Break down processing into smaller chunks");
+  out.push(COMPLEXITY_RULE);
+  console.log(out.join("\n"));
 }
 
 // ============================================================================
@@ -0,0 +1,175 @@
+/**
+ * Tests for CPU profile analysis
+ */
+
+import { assertEquals } from "https://deno.land/std@0.224.0/assert/mod.ts";
+import {
+  analyzeComplexity,
+  analyzeHotPaths,
+  CPUProfile,
+  detectAsyncIssues,
+  generateFlameGraph,
+  getFunctionTimes,
+} from "./cpu_profiler.ts";
+import type { CPUProfileData, CPUProfileNode } from "./types.ts";
+
+function makeNode(
+  id: number,
+  functionName: string,
+  url: string,
+  lineNumber: number,
+  children: number[] = [],
+): CPUProfileNode {
+  return {
+    id,
+    callFrame: { functionName, scriptId: "1", url, lineNumber, columnNumber: 0 },
+    hitCount: 0,
+    children,
+  };
+}
+
+// (root) -> main -> Promise.then, (root) -> handleCallback
+function makeProfileData(): CPUProfileData {
+  return {
+    nodes: [
+      makeNode(1, "(root)", "", 0, [2, 3]),
+      makeNode(2, "main", "file:///app/main.ts", 10, [4]),
+      makeNode(3, "handleCallback", "file:///app/events.ts", 5),
+      makeNode(4, "Promise.then", "file:///app/main.ts", 20),
+    ],
+    startTime: 0,
+    endTime: 5000,
+    samples: [2, 4, 4, 3, 4],
+    timeDeltas: [1000, 1000, 1000, 1000, 1000],
+  };
+}
+
+Deno.test("CPUProfile - counts self and inclusive samples", () => {
+  const profile = new CPUProfile(makeProfileData());
+  assertEquals(profile.totalSamples, 5);
+  assertEquals(profile.sampleCounts.get(4), 3);
+  assertEquals(profile.inclusiveSamples.get(1), 5);
+  assertEquals(profile.inclusiveSamples.get(2), 4);
+  assertEquals(profile.inclusiveSamples.get(3), 1);
+  assertEquals(profile.inclusiveSamples.get(4), 3);
+  assertEquals(profile.parentMap.get(4), 2);
+});
+
+Deno.test("CPUProfile - getCallTree nests children under the root", () => {
+  const profile = new CPUProfile(makeProfileData());
+  const [root] = profile.getCallTree();
+  assertEquals(root.function, "(root)");
+  assertEquals(root.children.map((c) => c.function), ["main", "handleCallback"]);
+  assertEquals(root.children[0].children[0].totalSamples, 3);
+
+  assertEquals(profile.getCallTree(undefined, 1)[0].children[0].children, []);
+  assertEquals(profile.getCallTree(undefined, -1), []);
+});
+
+Deno.test("CPUProfile - getCallTree walks chains deeper than the call stack", () => {
+  const depth = 20000;
+  const nodes = Array.from(
+    { length: depth },
+    (_, i) => makeNode(i + 1, `f${i}`, "file:///app/deep.ts", i, i + 1 < depth ? [i + 2] : []),
+  );
+  const profile = new CPUProfile({
+    nodes,
+    startTime: 0,
+    endTime: 1,
+    samples: [depth],
+    timeDeltas: [1],
+  });
+
+  let node = profile.getCallTree(undefined, depth)[0];
+  let levels = 1;
+  while (node.children.length > 0) {
+    node = node.children[0];
+    levels++;
+  }
+  assertEquals(levels, depth);
+  assertEquals(node.totalSamples, 1);
+});
+
+Deno.test("CPUProfile - getHotFunctions ranks by inclusive samples and keeps tie order", () => {
+  const data = makeProfileData();
+  data.samples = [2, 4, 3, 4, 3];
+  const hot = new CPUProfile(data).getHotFunctions(3);
+  assertEquals(hot.map((h) => [h.functionName, h.totalSamples]), [
+    ["(root)", 5],
+    ["main", 3],
+    ["handleCallback", 2],
+  ]);
+  assertEquals(hot[1].totalPct, 60);
+});
+
+Deno.test("analyzeHotPaths - reports call paths for hot nodes", () => {
+  const profile = new CPUProfile(makeProfileData());
+  const hot = analyzeHotPaths(profile, 50);
+  assertEquals(hot.map((h) => `${h.function} ${h.pct}%`), [
+    "(root) 100%",
+    "main 80%",
+    "Promise.then 60%",
+  ]);
+  assertEquals(hot[2].callPath, "(root):0 -> main:10 -> Promise.then:20");
+});
+
+Deno.test("detectAsyncIssues - attributes samples to async patterns", () => {
+  const profile = new CPUProfile(makeProfileData());
+  const result = detectAsyncIssues(profile);
+  assertEquals(result.promiseNodeCount, 1);
+  assertEquals(result.promiseRelatedPct, 60);
+  assertEquals(result.callbackNodeCount, 1);
+  assertEquals(result.callbackRelatedPct, 20);
+  assertEquals(result.awaitNodeCount, 0);
+});
+
+Deno.test("getFunctionTimes - filters by url", () => {
+  const profile = new CPUProfile(makeProfileData());
+  const times = getFunctionTimes(profile, "main.ts");
+  assertEquals(times.map((t) => t.function), ["main", "Promise.then"]);
+  assertEquals(times[0].totalTimePct, 80);
+});
+
+Deno.test("generateFlameGraph - emits collapsed stacks with counts", () => {
+  const profile = new CPUProfile(makeProfileData());
+  const lines = generateFlameGraph(profile).split("\n").sort();
+  assertEquals(lines, [
+    "(root) (:0);handleCallback (events.ts:5) 1",
+    "(root) (:0);main (main.ts:10) 1",
+    "(root) (:0);main (main.ts:10);Promise.then (main.ts:20) 3",
+  ]);
+});
+
+Deno.test("generateFlameGraph - merges distinct nodes that render the same stack", () => {
+  const data = makeProfileData();
+  // A second "Promise.then" node at the same location under main
+  data.nodes[1].children = [4, 5];
+  data.nodes.push(makeNode(5, "Promise.then", "file:///app/main.ts", 20));
+  data.samples.push(5, 5);
+  data.timeDeltas.push(1000, 1000);
+
+  const lines = generateFlameGraph(new CPUProfile(data)).split("\n");
+  assertEquals(lines[1], "(root) (:0);main (main.ts:10);Promise.then (main.ts:20) 5");
+  assertEquals(lines.length, 3);
+});
+
+Deno.test("analyzeComplexity - flags hot functions with quadratic-looking names", () => {
+  const compareAll = { ...makeNode(2, "compareAll", "file:///app/dedupe.ts", 7), hitCount: 3 };
+  const profile = new CPUProfile({
+    nodes: [makeNode(1, "(root)", "", 0, [2]), compareAll],
+    startTime: 0,
+    endTime: 3000,
+    samples: [2, 2, 2],
+    timeDeltas: [1000, 1000, 1000],
+  });
+
+  const [issue] = analyzeComplexity(profile);
+  assertEquals(issue.functionName, "compareAll");
+  assertEquals(issue.severity, "critical");
+  assertEquals(issue.suspectedComplexity, "Likely O(n²)");
+  assertEquals(issue.evidence, [
+    "Consumes 100.0% of total CPU time",
+    'Function name suggests iteration: "compareAll"',
+    'Function name "compareAll" with high CPU suggests nested iteration',
+  ]);
+});
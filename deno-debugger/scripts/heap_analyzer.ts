@@ -46,6 +46,16 @@ export interface LargestObject {
   sizeMB: number;
 }
 
+// Per (type, name) totals, keyed by `${nodeType}|${name}`
+export interface SummaryEntry {
+  nodeType: string;
+  name: string;
+  count: number;
+  size: number;
+}
+
+export type TypeNameSummary = Map<string, SummaryEntry>;
+
 export interface HeapSnapshotOptions {
   /**
    * Skip parsing edges (faster, but can't find retaining paths)
@@ -62,18 +72,213 @@ export interface HeapSnapshotOptions {
   skipRetention?: boolean;
 }
 
+export interface SummaryCacheOptions {
+  /**
+   * Reuse a `<snapshot>.summary.json` sidecar written by an earlier run, and
+   * write one if missing. The sidecar is keyed on the snapshot's size and
+   * modification time, so a rewritten snapshot is summarized again.
+   * Default: false
+   */
+  cacheSummary?: boolean;
+}
+
+export interface LeakDetectionOptions extends SummaryCacheOptions {
+  /**
+   * Summarize up to this many snapshot files at once, each in its own Worker.
+   * Every worker holds one fully parsed snapshot, so peak memory grows with it.
+   * Default: 1 (sequential, no workers)
+   */
+  concurrency?: number;
+}
+
+// On-disk form of a TypeNameSummary
+interface SummaryCacheFile {
+  version: number;
+  size: number;
+  mtimeMs: number | null;
+  entries: Array<[nodeType: string, name: string, count: number, size: number]>;
+}
+
+const SUMMARY_CACHE_VERSION = 1;
+
+const RETAINING_PATH_CACHE_SIZE = 4096;
+
+// Above this many results findLargestObjects sorts instead of keeping a bounded heap
+const TOP_K_HEAP_LIMIT = 1000;
+
+// ============================================================================
+// Graph Kernels
+// ============================================================================
+// Standalone loops over typed arrays. Keeping them out of the class means each
+// only ever sees one argument shape, so V8 optimizes them as tight kernels.
+
+/**
+ * Offset of each named field within a row of a flat nodes/edges array.
+ * A missing required field throws instead of yielding -1, which would
+ * silently read the neighbouring column; missing optional fields map to -1.
+ */
+function resolveFieldOffsets<K extends string>(
+  fields: string[],
+  required: readonly K[],
+  optional: readonly K[] = [],
+): Record<K, number> {
+  const offsets = {} as Record<K, number>;
+  for (const name of required) {
+    const offset = fields.indexOf(name);
+    if (offset === -1) {
+      throw new Error(
+        `Unsupported heap snapshot format: missing "${name}" in [${fields.join(", ")}]`,
+      );
+    }
+    offsets[name] = offset;
+  }
+  for (const name of optional) {
+    offsets[name] = fields.indexOf(name);
+  }
+  return offsets;
+}
+
+/**
+ * Edges are stored grouped by source node, so a prefix sum over edge_count
+ * gives each node's first edge (with a trailing end sentinel)
+ */
+function buildFirstEdgeIndex(edgeCounts: Uint32Array, nodeCount: number): Uint32Array {
+  const firstEdge = new Uint32Array(nodeCount + 1);
+  for (let n = 0; n < nodeCount; n++) {
+    firstEdge[n + 1] = firstEdge[n] + edgeCounts[n];
+  }
+  return firstEdge;
+}
+
+/**
+ * Reverse the edge graph into CSR form by counting sort on target node:
+ * count, prefix sum, then scatter. Slots keep edge order within each target.
+ */
+function buildRetainerIndex(
+  firstEdge: Uint32Array,
+  edgeToNode: Uint32Array,
+  nodeCount: number,
+  edgeCount: number,
+): { offsets: Uint32Array; nodes: Uint32Array; edges: Uint32Array } {
+  const edgeEnd = Math.min(firstEdge[nodeCount], edgeCount);
+
+  const offsets = new Uint32Array(nodeCount + 1);
+  for (let e = 0; e < edgeEnd; e++) {
+    const target = edgeToNode[e];
+    if (target < nodeCount) {
+      offsets[target + 1]++;
+    }
+  }
+  for (let n = 0; n < nodeCount; n++) {
+    offsets[n + 1] += offsets[n];
+  }
+
+  const cursor = offsets.slice(0, nodeCount);
+  const nodes = new Uint32Array(offsets[nodeCount]);
+  const edges = new Uint32Array(offsets[nodeCount]);
+  for (let n = 0; n < nodeCount; n++) {
+    const end = Math.min(firstEdge[n + 1], edgeEnd);
+    for (let e = firstEdge[n]; e < end; e++) {
+      const target = edgeToNode[e];
+      if (target < nodeCount) {
+        const slot = cursor[target]++;
+        nodes[slot] = n;
+        edges[slot] = e;
+      }
+    }
+  }
+
+  return { offsets, nodes, edges };
+}
+
+/**
+ * Group ordinals 0..keys.length-1 by key (counting sort): the ordinals with
+ * key k are ordinals[offsets[k] .. offsets[k + 1]], in ascending order
+ */
+function groupOrdinalsByKey(
+  keys: Uint32Array,
+  keyCount: number,
+): { offsets: Uint32Array; ordinals: Uint32Array } {
+  const offsets = new Uint32Array(keyCount + 1);
+  for (let i = 0; i < keys.length; i++) {
+    offsets[keys[i] + 1]++;
+  }
+  for (let k = 0; k < keyCount; k++) {
+    offsets[k + 1] += offsets[k];
+  }
+
+  const cursor = offsets.slice(0, keyCount);
+  const ordinals = new Uint32Array(keys.length);
+  for (let i = 0; i < keys.length; i++) {
+    ordinals[cursor[keys[i]]++] = i;
+  }
+
+  return { offsets, ordinals };
+}
+
+/**
+ * Copy a cached retaining path down to its nodes and edges, so a caller
+ * editing its result cannot change what later lookups return
+ */
+function copyRetainingPath(path: RetainingPath | null): RetainingPath | null {
+  if (!path) {
+    return null;
+  }
+  return {
+    distance: path.distance,
+    path: path.path.map((step) => ({ node: { ...step.node }, edge: { ...step.edge } })),
+  };
+}
+
 export class HeapSnapshot {
   public rawData: HeapSnapshotData;
   public snapshot: HeapSnapshotData["snapshot"];
-  public nodes: HeapNode[] = [];
-  public edges: HeapEdge[] = [];
   public strings: string[];
   public traceFunctionInfos: number[];
   public traceTree: number[];
-  public nodeById: Map<number, HeapNode>;
-  public retainedBy: Map<number, Array<[number, HeapEdge]>>;
+
+  // Node columns (struct-of-arrays), indexed by node ordinal
+  public nodeCount = 0;
+  public nodeTypes: string[];
+  public nodeTypeIdx: Uint32Array = new Uint32Array(0);
+  public nodeNameIdx: Uint32Array = new Uint32Array(0);
+  public nodeIds: Uint32Array = new Uint32Array(0);
+  public nodeSelfSize: Float64Array = new Float64Array(0);
+  public nodeEdgeCount: Uint32Array = new Uint32Array(0);
+  public nodeTraceId: Uint32Array = new Uint32Array(0);
+
+  // Edge columns, indexed by edge ordinal. Edges owned by node n are
+  // firstEdge[n] .. firstEdge[n + 1]; edgeToNode holds the target node ordinal.
+  public edgeCount = 0;
+  public edgeTypes: string[];
+  public edgeTypeIdx: Uint32Array = new Uint32Array(0);
+  public edgeNameOrIndex: Uint32Array = new Uint32Array(0);
+  public edgeToNode: Uint32Array = new Uint32Array(0);
+  public firstEdge: Uint32Array = new Uint32Array(1);
+
+  // Retainer index (CSR): the retainers of node n are slots
+  // retainerOffsets[n] .. retainerOffsets[n + 1] of retainerNodes (source
+  // node ordinal) and retainerEdges (edge ordinal)
+  public retainerOffsets: Uint32Array = new Uint32Array(1);
+  public retainerNodes: Uint32Array = new Uint32Array(0);
+  public retainerEdges: Uint32Array = new Uint32Array(0);
+
+  private nodeFieldCount: number;
   private options: HeapSnapshotOptions;
 
+  // HeapNode/HeapEdge objects are only built when something asks for them
+  private nodeCache?: HeapNode[];
+  private edgeCache?: HeapEdge[];
+  private nodeByIdCache?: Map<number, HeapNode>;
+  private retainedByCache?: Map<number, Array<[number, HeapEdge]>>;
+  private ordinalById?: Map<number, number>;
+  private gcRootOrdinals?: Set<number>;
+  private typeGroups?: { offsets: Uint32Array; ordinals: Uint32Array };
+  private nameGroups?: { offsets: Uint32Array; ordinals: Uint32Array };
+  private stringIndexes?: Map<string, number[]>;
+  private sizeSummary?: NodeSizeSummary[];
+  private retainingPathCache = new Map<string, RetainingPath | null>();
+
   constructor(snapshotData: HeapSnapshotData, options: HeapSnapshotOptions = {}) {
     this.options = {
       skipEdges: options.skipEdges ?? false,
@@ -85,6 +290,9 @@ export class HeapSnapshot {
     this.strings = snapshotData.strings || [];
     this.traceFunctionInfos = snapshotData.trace_function_infos || [];
     this.traceTree = snapshotData.trace_tree || [];
+    this.nodeTypes = this.snapshot.meta.node_types[0];
+    this.edgeTypes = this.snapshot.meta.edge_types[0];
+    this.nodeFieldCount = this.snapshot.meta.node_fields.length;
 
     // Always parse nodes (needed for summaries)
     this.parseNodes();
@@ -94,149 +302,302 @@ export class HeapSnapshot {
       this.parseEdges();
     }
 
-    // Build indexes
-    this.nodeById = new Map(this.nodes.map((n) => [n.id, n]));
-    this.retainedBy = new Map();
-
     // Optionally build retention index (very expensive)
     if (!this.options.skipRetention && !this.options.skipEdges) {
       this.buildRetentionIndex();
     }
   }
 
+  /** All nodes as objects (materialized once on first access; read-only) */
+  get nodes(): readonly HeapNode[] {
+    if (!this.nodeCache) {
+      const nodes: HeapNode[] = [];
+      for (let n = 0; n < this.nodeCount; n++) {
+        nodes.push(this.makeNode(n));
+      }
+      this.nodeCache = nodes;
+    }
+    return this.nodeCache;
+  }
+
+  /** All edges as objects (materialized once on first access; read-only) */
+  get edges(): readonly HeapEdge[] {
+    if (!this.edgeCache) {
+      const edges: HeapEdge[] = [];
+      let from = 0;
+      for (let e = 0; e < this.edgeCount; e++) {
+        while (from < this.nodeCount - 1 && e >= this.firstEdge[from + 1]) {
+          from++;
+        }
+        edges.push(this.makeEdge(e, from));
+      }
+      this.edgeCache = edges;
+    }
+    return this.edgeCache;
+  }
+
+  /** Nodes by id (built once on first access; read-only) */
+  get nodeById(): ReadonlyMap<number, HeapNode> {
+    if (!this.nodeByIdCache) {
+      this.nodeByIdCache = new Map(this.nodes.map((n) => [n.id, n]));
+    }
+    return this.nodeByIdCache;
+  }
+
+  /** Retainers by target node id, as (retainer id, edge) pairs (built once; read-only) */
+  get retainedBy(): ReadonlyMap<number, ReadonlyArray<readonly [number, HeapEdge]>> {
+    if (!this.retainedByCache) {
+      const retainedBy = new Map<number, Array<[number, HeapEdge]>>();
+      const offsets = this.retainerOffsets;
+      for (let n = 0; n + 1 < offsets.length; n++) {
+        if (offsets[n] === offsets[n + 1]) {
+          continue;
+        }
+        const retainers: Array<[number, HeapEdge]> = [];
+        for (let j = offsets[n]; j < offsets[n + 1]; j++) {
+          const source = this.retainerNodes[j];
+          retainers.push([this.nodeIds[source], this.makeEdge(this.retainerEdges[j], source)]);
+        }
+        retainedBy.set(this.nodeIds[n], retainers);
+      }
+      this.retainedByCache = retainedBy;
+    }
+    return this.retainedByCache;
+  }
+
+  /** Type of the node at the given ordinal */
+  getNodeType(ordinal: number): string {
+    return this.nodeTypes[this.nodeTypeIdx[ordinal]];
+  }
+
+  /** Name of the node at the given ordinal, resolved from the string table */
+  getNodeName(ordinal: number): string {
+    return this.strings[this.nodeNameIdx[ordinal]];
+  }
+
+  /** Node at the given ordinal (position in the node columns) */
+  getNode(ordinal: number): HeapNode {
+    return this.nodeCache ? this.nodeCache[ordinal] : this.makeNode(ordinal);
+  }
+
+  getNodeById(nodeId: number): HeapNode | undefined {
+    const ordinal = this.ordinalOf(nodeId);
+    return ordinal === undefined ? undefined : this.getNode(ordinal);
+  }
+
+  private ordinalOf(nodeId: number): number | undefined {
+    if (!this.ordinalById) {
+      const ordinalById = new Map<number, number>();
+      for (let n = 0; n < this.nodeCount; n++) {
+        ordinalById.set(this.nodeIds[n], n);
+      }
+      this.ordinalById = ordinalById;
+    }
+    return this.ordinalById.get(nodeId);
+  }
+
+  private makeNode(n: number): HeapNode {
+    return {
+      type: this.getNodeType(n),
+      name: this.getNodeName(n),
+      id: this.nodeIds[n],
+      self_size: this.nodeSelfSize[n],
+      edge_count: this.nodeEdgeCount[n],
+      trace_node_id: this.nodeTraceId[n],
+      index: n * this.nodeFieldCount,
+    };
+  }
+
+  private makeEdge(e: number, from: number): HeapEdge {
+    const type = this.edgeTypes[this.edgeTypeIdx[e]];
+    const nameOrIndex = this.edgeNameOrIndex[e];
+    return {
+      type,
+      // Name or index depends on edge type
+      name_or_index: type === "property" || type === "internal"
+        ? this.strings[nameOrIndex]
+        : nameOrIndex,
+      to_node: this.edgeToNode[e] * this.nodeFieldCount,
+      from_node: from < this.nodeCount ? this.nodeIds[from] : 0,
+    };
+  }
+
   private parseNodes(): void {
-    const meta = this.snapshot.meta;
-    const nodeFields = meta.node_fields;
-    const nodeTypes = meta.node_types[0];
+    const nodeFields = this.snapshot.meta.node_fields;
 
     // Field indices
-    const typeIdx = nodeFields.indexOf("type");
-    const nameIdx = nodeFields.indexOf("name");
-    const idIdx = nodeFields.indexOf("id");
-    const selfSizeIdx = nodeFields.indexOf("self_size");
-    const edgeCountIdx = nodeFields.indexOf("edge_count");
-    const traceNodeIdIdx = nodeFields.indexOf("trace_node_id");
-
-    const nodeFieldCount = nodeFields.length;
+    const {
+      type: typeIdx,
+      name: nameIdx,
+      id: idIdx,
+      self_size: selfSizeIdx,
+      edge_count: edgeCountIdx,
+      trace_node_id: traceNodeIdIdx,
+    } = resolveFieldOffsets(
+      nodeFields,
+      ["type", "name", "id", "self_size", "edge_count"],
+      ["trace_node_id"],
+    );
+
+    const nodeFieldCount = this.nodeFieldCount;
     const nodesData = this.rawData.nodes;
+    const count = Math.ceil(nodesData.length / nodeFieldCount);
+
+    const types = new Uint32Array(count);
+    const names = new Uint32Array(count);
+    const ids = new Uint32Array(count);
+    const selfSizes = new Float64Array(count);
+    const edgeCounts = new Uint32Array(count);
+    const traceIds = new Uint32Array(count);
+
+    for (let n = 0, i = 0; n < count; n++, i += nodeFieldCount) {
+      types[n] = nodesData[i + typeIdx];
+      names[n] = nodesData[i + nameIdx];
+      ids[n] = nodesData[i + idIdx];
+      selfSizes[n] = nodesData[i + selfSizeIdx];
+      edgeCounts[n] = nodesData[i + edgeCountIdx];
+    }
 
-    for (let i = 0; i < nodesData.length; i += nodeFieldCount) {
-      const node: HeapNode = {
-        type: nodeTypes[nodesData[i + typeIdx]],
-        name: this.strings[nodesData[i + nameIdx]],
-        id: nodesData[i + idIdx],
-        self_size: nodesData[i + selfSizeIdx],
-        edge_count: nodesData[i + edgeCountIdx],
-        trace_node_id: nodesData[i + traceNodeIdIdx],
-        index: i,
-      };
-      this.nodes.push(node);
+    // trace_node_id is only present when allocation tracking was on
+    if (traceNodeIdIdx !== -1) {
+      for (let n = 0, i = 0; n < count; n++, i += nodeFieldCount) {
+        traceIds[n] = nodesData[i + traceNodeIdIdx];
+      }
     }
+
+    this.nodeCount = count;
+    this.nodeTypeIdx = types;
+    this.nodeNameIdx = names;
+    this.nodeIds = ids;
+    this.nodeSelfSize = selfSizes;
+    this.nodeEdgeCount = edgeCounts;
+    this.nodeTraceId = traceIds;
   }
 
   private parseEdges(): void {
-    const meta = this.snapshot.meta;
-    const edgeFields = meta.edge_fields;
-    const edgeTypes = meta.edge_types[0];
+    const edgeFields = this.snapshot.meta.edge_fields;
 
     // Field indices
-    const typeIdx = edgeFields.indexOf("type");
-    const nameOrIndexIdx = edgeFields.indexOf("name_or_index");
-    const toNodeIdx = edgeFields.indexOf("to_node");
+    const {
+      type: typeIdx,
+      name_or_index: nameOrIndexIdx,
+      to_node: toNodeIdx,
+    } = resolveFieldOffsets(edgeFields, ["type", "name_or_index", "to_node"]);
 
     const edgeFieldCount = edgeFields.length;
+    const nodeFieldCount = this.nodeFieldCount;
     const edgesData = this.rawData.edges;
+    const count = Math.ceil(edgesData.length / edgeFieldCount);
 
-    let fromNodeIndex = 0;
+    const types = new Uint32Array(count);
+    const namesOrIndexes = new Uint32Array(count);
+    const toNodes = new Uint32Array(count);
 
-    for (let i = 0; i < edgesData.length; i += edgeFieldCount) {
-      // Find which node this edge belongs to
-      while (
-        fromNodeIndex < this.nodes.length - 1 &&
-        i >= this.calculateEdgeStartIndex(fromNodeIndex + 1)
-      ) {
-        fromNodeIndex++;
-      }
+    for (let e = 0, i = 0; e < count; e++, i += edgeFieldCount) {
+      types[e] = edgesData[i + typeIdx];
+      namesOrIndexes[e] = edgesData[i + nameOrIndexIdx];
+      toNodes[e] = Math.floor(edgesData[i + toNodeIdx] / nodeFieldCount);
+    }
 
-      const edgeType = edgeTypes[edgesData[i + typeIdx]];
-      let nameOrIndex: string | number = edgesData[i + nameOrIndexIdx];
+    const firstEdge = buildFirstEdgeIndex(this.nodeEdgeCount, this.nodeCount);
 
-      // Name or index depends on edge type
-      if (edgeType === "property" || edgeType === "internal") {
-        nameOrIndex = this.strings[nameOrIndex];
-      }
+    this.edgeCount = count;
+    this.edgeTypeIdx = types;
+    this.edgeNameOrIndex = namesOrIndexes;
+    this.edgeToNode = toNodes;
+    this.firstEdge = firstEdge;
+  }
 
-      const edge: HeapEdge = {
-        type: edgeType,
-        name_or_index: nameOrIndex,
-        to_node: edgesData[i + toNodeIdx],
-        from_node: fromNodeIndex < this.nodes.length ? this.nodes[fromNodeIndex].id : 0,
-      };
-      this.edges.push(edge);
-    }
+  private buildRetentionIndex(): void {
+    const index = buildRetainerIndex(
+      this.firstEdge,
+      this.edgeToNode,
+      this.nodeCount,
+      this.edgeCount,
+    );
+    this.retainerOffsets = index.offsets;
+    this.retainerNodes = index.nodes;
+    this.retainerEdges = index.edges;
   }
 
-  private calculateEdgeStartIndex(nodeIndex: number): number {
-    // Calculate where this node's edges start in the edges array
-    let edgeCount = 0;
-    for (let i = 0; i < nodeIndex && i < this.nodes.length; i++) {
-      edgeCount += this.nodes[i].edge_count;
+  getNodesByType(nodeType: string): HeapNode[] {
+    const typeIndex = this.nodeTypes.indexOf(nodeType);
+    if (typeIndex === -1) {
+      return [];
     }
-    return edgeCount * this.snapshot.meta.edge_fields.length;
+    // Built on first lookup; later lookups are a slice of the grouped ordinals
+    this.typeGroups ??= groupOrdinalsByKey(this.nodeTypeIdx, this.nodeTypes.length);
+    return this.collectGroup(this.typeGroups, typeIndex, []);
   }
 
-  private buildRetentionIndex(): void {
-    const nodeFieldCount = this.snapshot.meta.node_fields.length;
-
-    let edgeIdx = 0;
-    for (const node of this.nodes) {
-      for (let i = 0; i < node.edge_count; i++) {
-        if (edgeIdx < this.edges.length) {
-          const edge = this.edges[edgeIdx];
-          // Map target node -> (source node, edge)
-          const targetNodeIdx = Math.floor(edge.to_node / nodeFieldCount);
-          if (targetNodeIdx < this.nodes.length) {
-            const targetNode = this.nodes[targetNodeIdx];
-            if (!this.retainedBy.has(targetNode.id)) {
-              this.retainedBy.set(targetNode.id, []);
-            }
-            this.retainedBy.get(targetNode.id)!.push([node.id, edge]);
-          }
-          edgeIdx++;
+  getNodesByName(name: string): HeapNode[] {
+    if (!this.stringIndexes) {
+      const stringIndexes = new Map<string, number[]>();
+      this.strings.forEach((value, index) => {
+        const indexes = stringIndexes.get(value);
+        if (indexes) {
+          indexes.push(index);
+        } else {
+          stringIndexes.set(value, [index]);
         }
-      }
+      });
+      this.stringIndexes = stringIndexes;
     }
-  }
+    this.nameGroups ??= groupOrdinalsByKey(this.nodeNameIdx, this.strings.length);
 
-  getNodesByType(nodeType: string): HeapNode[] {
-    return this.nodes.filter((n) => n.type === nodeType);
+    const result: HeapNode[] = [];
+    const indexes = this.stringIndexes.get(name) || [];
+    for (const index of indexes) {
+      this.collectGroup(this.nameGroups, index, result);
+    }
+    // Duplicate string-table entries each contribute a group; keep node order
+    return indexes.length > 1 ? result.sort((a, b) => a.index - b.index) : result;
   }
 
-  getNodesByName(name: string): HeapNode[] {
-    return this.nodes.filter((n) => n.name === name);
+  /** Append the nodes grouped under key to result */
+  private collectGroup(
+    groups: { offsets: Uint32Array; ordinals: Uint32Array },
+    key: number,
+    result: HeapNode[],
+  ): HeapNode[] {
+    for (let j = groups.offsets[key]; j < groups.offsets[key + 1]; j++) {
+      result.push(this.getNode(groups.ordinals[j]));
+    }
+    return result;
   }
 
   getNodeSizeSummary(): NodeSizeSummary[] {
-    const summary = new Map<string, { count: number; totalSize: number }>();
+    // The columns never change after parsing, so one scan serves every
+    // caller; each gets its own copy, so editing it cannot affect the next
+    if (this.sizeSummary) {
+      return this.sizeSummary.map((row) => ({ ...row }));
+    }
 
-    for (const node of this.nodes) {
-      const stats = summary.get(node.type) || { count: 0, totalSize: 0 };
-      stats.count++;
-      stats.totalSize += node.self_size;
-      summary.set(node.type, stats);
+    // Accumulate per type index; there are only a handful of node types
+    const typeCount = this.nodeTypes.length;
+    const counts = new Float64Array(typeCount);
+    const totals = new Float64Array(typeCount);
+
+    for (let n = 0; n < this.nodeCount; n++) {
+      const t = this.nodeTypeIdx[n];
+      counts[t]++;
+      totals[t] += this.nodeSelfSize[n];
     }
 
     const result: NodeSizeSummary[] = [];
-    for (const [nodeType, stats] of summary.entries()) {
-      result.push({
-        nodeType,
-        count: stats.count,
-        totalSize: stats.totalSize,
-        avgSize: stats.count > 0 ? stats.totalSize / stats.count : 0,
-      });
+    for (let t = 0; t < typeCount; t++) {
+      if (counts[t] > 0) {
+        result.push({
+          nodeType: this.nodeTypes[t],
+          count: counts[t],
+          totalSize: totals[t],
+          avgSize: totals[t] / counts[t],
+        });
+      }
     }
 
-    return result.sort((a, b) => b.totalSize - a.totalSize);
+    this.sizeSummary = result.sort((a, b) => b.totalSize - a.totalSize);
+    return this.sizeSummary.map((row) => ({ ...row }));
   }
 
   findRetainingPath(nodeId: number, maxDepth = 10): RetainingPath | null {
@@ -248,49 +609,116 @@ export class HeapSnapshot {
       );
     }
 
-    // BFS from node backwards to root
-    const visited = new Set<number>();
-    const queue: Array<[number, Array<{ node: HeapNode; edge: HeapEdge }>]> = [[nodeId, []]];
+    // Repeated queries for the same top leakers are common in interactive
+    // sessions; keep recent results, evicting the oldest once full
+    const cacheKey = `${nodeId}:${maxDepth}`;
+    const cached = this.retainingPathCache.get(cacheKey);
+    if (cached !== undefined) {
+      this.retainingPathCache.delete(cacheKey);
+      this.retainingPathCache.set(cacheKey, cached);
+      return copyRetainingPath(cached);
+    }
 
-    while (queue.length > 0) {
-      const [currentId, path] = queue.shift()!;
+    const result = this.searchRetainingPath(nodeId, maxDepth);
+    if (this.retainingPathCache.size >= RETAINING_PATH_CACHE_SIZE) {
+      this.retainingPathCache.delete(this.retainingPathCache.keys().next().value!);
+    }
+    this.retainingPathCache.set(cacheKey, result);
+    return copyRetainingPath(result);
+  }
 
-      if (visited.has(currentId) || path.length > maxDepth) {
-        continue;
-      }
-      visited.add(currentId);
+  private searchRetainingPath(nodeId: number, maxDepth: number): RetainingPath | null {
+    const start = this.ordinalOf(nodeId);
+    if (start === undefined) {
+      return null;
+    }
 
-      const currentNode = this.nodeById.get(currentId);
-      if (!currentNode) {
-        continue;
-      }
+    // BFS from node backwards to root. Each reached node remembers the
+    // retainer slot it was first reached through, so the path is rebuilt
+    // once at the end instead of being copied at every step.
+    const offsets = this.retainerOffsets;
+    const retainerNodes = this.retainerNodes;
+    const gcRoots = this.getGcRootOrdinals();
+    const parentSlot = new Map<number, number>([[start, -1]]);
+    const queue = [start];
+    const depths = [0];
+
+    for (let head = 0; head < queue.length; head++) {
+      const current = queue[head];
 
       // Check if this is a root node
-      if (currentNode.type === "synthetic" && currentNode.name === "(GC roots)") {
+      if (gcRoots.has(current)) {
+        const path = this.buildRetainingPath(current, start, parentSlot);
         return {
           path,
           distance: path.length,
         };
       }
 
+      const depth = depths[head];
+      if (depth >= maxDepth) {
+        continue;
+      }
+
       // Follow retainers
-      const retainers = this.retainedBy.get(currentId) || [];
-      for (const [retainerId, edge] of retainers) {
-        const retainerNode = this.nodeById.get(retainerId);
-        if (retainerNode) {
-          const newPath = [{ node: retainerNode, edge }, ...path];
-          queue.push([retainerId, newPath]);
+      for (let j = offsets[current]; j < offsets[current + 1]; j++) {
+        const source = retainerNodes[j];
+        if (!parentSlot.has(source)) {
+          parentSlot.set(source, j);
+          queue.push(source);
+          depths.push(depth + 1);
         }
       }
     }
 
     return null; // No path found
   }
+
+  private getGcRootOrdinals(): Set<number> {
+    if (!this.gcRootOrdinals) {
+      const gcRoots = new Set<number>();
+      const syntheticIdx = this.nodeTypes.indexOf("synthetic");
+      for (let n = 0; n < this.nodeCount; n++) {
+        if (
+          this.nodeTypeIdx[n] === syntheticIdx &&
+          this.strings[this.nodeNameIdx[n]] === "(GC roots)"
+        ) {
+          gcRoots.add(n);
+        }
+      }
+      this.gcRootOrdinals = gcRoots;
+    }
+    return this.gcRootOrdinals;
+  }
+
+  /** Walk parent slots from the root back down to the start node */
+  private buildRetainingPath(
+    root: number,
+    start: number,
+    parentSlot: Map<number, number>,
+  ): RetainingPath["path"] {
+    const path: RetainingPath["path"] = [];
+    let ordinal = root;
+    while (ordinal !== start) {
+      const edge = this.retainerEdges[parentSlot.get(ordinal)!];
+      path.push({ node: this.getNode(ordinal), edge: this.makeEdge(edge, ordinal) });
+      ordinal = this.edgeToNode[edge];
+    }
+    return path;
+  }
+}
+
+/**
+ * Parse raw heap snapshot JSON.
+ * JSON.parse is V8's native parser, so the only cost worth avoiding is
+ * holding extra copies of the (potentially huge) source text around it.
+ */
+function parseSnapshotJson(json: string): HeapSnapshotData {
+  return JSON.parse(json) as HeapSnapshotData;
 }
 
 export async function loadSnapshot(filePath: string): Promise<HeapSnapshot> {
-  const data = JSON.parse(await Deno.readTextFile(filePath)) as HeapSnapshotData;
-  return new HeapSnapshot(data);
+  return new HeapSnapshot(parseSnapshotJson(await Deno.readTextFile(filePath)));
 }
 
 export async function captureSnapshot(
@@ -298,55 +726,91 @@ export async function captureSnapshot(
   outputPath?: string,
 ): Promise<HeapSnapshot> {
   console.log("Capturing heap snapshot... (this may take a few seconds)");
-  const snapshotJson = await cdpClient.takeHeapSnapshot();
 
   if (outputPath) {
-    await Deno.writeTextFile(outputPath, snapshotJson);
+    // Stream chunks straight to disk so the chunk list and the joined JSON
+    // text are never in memory at the same time, then parse from the file
+    await cdpClient.takeHeapSnapshotToFile(outputPath);
     console.log(`Snapshot saved to ${outputPath}`);
+    return await loadSnapshot(outputPath);
   }
 
-  const data = JSON.parse(snapshotJson) as HeapSnapshotData;
-  return new HeapSnapshot(data);
+  return new HeapSnapshot(parseSnapshotJson(await cdpClient.takeHeapSnapshot()));
 }
 
-export function compareSnapshots(before: HeapSnapshot, after: HeapSnapshot): ComparisonRow[] {
-  // Build summaries by (type, name)
-  function summarize(snapshot: HeapSnapshot) {
-    const summary = new Map<string, { count: number; size: number }>();
-    for (const node of snapshot.nodes) {
-      const key = `${node.type}|${node.name}`;
-      const stats = summary.get(key) || { count: 0, size: 0 };
+/**
+ * Build count/size totals by (type, name)
+ */
+function summarizeSnapshot(snapshot: HeapSnapshot): TypeNameSummary {
+  // Group on a numeric (type index, name index) key so the per-node loop
+  // never builds strings; keys are only formatted once per group
+  const stride = snapshot.strings.length + 1;
+  const groups = new Map<number, { count: number; size: number }>();
+  for (let n = 0; n < snapshot.nodeCount; n++) {
+    const key = snapshot.nodeTypeIdx[n] * stride + snapshot.nodeNameIdx[n];
+    const stats = groups.get(key);
+    if (stats) {
       stats.count++;
-      stats.size += node.self_size;
-      summary.set(key, stats);
+      stats.size += snapshot.nodeSelfSize[n];
+    } else {
+      groups.set(key, { count: 1, size: snapshot.nodeSelfSize[n] });
     }
-    return summary;
   }
 
-  const beforeSummary = summarize(before);
-  const afterSummary = summarize(after);
+  return resolveTypeNameGroups(groups, stride, snapshot.nodeTypes, snapshot.strings);
+}
 
-  // Find all keys that exist in either snapshot
-  const allKeys = new Set([...beforeSummary.keys(), ...afterSummary.keys()]);
+/**
+ * Turn numeric (type index * stride + name index) groups into a summary keyed
+ * by type and name strings
+ */
+function resolveTypeNameGroups(
+  groups: Map<number, { count: number; size: number }>,
+  stride: number,
+  nodeTypes: string[],
+  strings: string[],
+): TypeNameSummary {
+  const summary: TypeNameSummary = new Map();
+  for (const [key, stats] of groups) {
+    const nodeType = nodeTypes[Math.floor(key / stride)];
+    const name = strings[key % stride];
+    const summaryKey = `${nodeType}|${name}`;
+    // Duplicate entries in the string table map to the same key
+    const existing = summary.get(summaryKey);
+    if (existing) {
+      existing.count += stats.count;
+      existing.size += stats.size;
+    } else {
+      summary.set(summaryKey, { nodeType, name, count: stats.count, size: stats.size });
+    }
+  }
+  return summary;
+}
 
+/**
+ * Rows for every (type, name) that grew between two summaries, largest first
+ */
+function diffSummaries(before: TypeNameSummary, after: TypeNameSummary): ComparisonRow[] {
   const data: ComparisonRow[] = [];
-  for (const key of allKeys) {
-    const [nodeType, name] = key.split("|");
-    const beforeStats = beforeSummary.get(key) || { count: 0, size: 0 };
-    const afterStats = afterSummary.get(key) || { count: 0, size: 0 };
 
-    const countDelta = afterStats.count - beforeStats.count;
-    const sizeDelta = afterStats.size - beforeStats.size;
+  // Keys only present in `before` can't have grown, so walking `after` is enough
+  for (const [key, afterStats] of after) {
+    const beforeStats = before.get(key);
+    const countBefore = beforeStats ? beforeStats.count : 0;
+    const sizeBefore = beforeStats ? beforeStats.size : 0;
+
+    const countDelta = afterStats.count - countBefore;
+    const sizeDelta = afterStats.size - sizeBefore;
 
     // Only include if there's actual growth
     if (countDelta > 0 || sizeDelta > 0) {
       data.push({
-        nodeType,
-        name,
-        countBefore: beforeStats.count,
+        nodeType: afterStats.nodeType,
+        name: afterStats.name,
+        countBefore,
         countAfter: afterStats.count,
         countDelta,
-        sizeBefore: beforeStats.size,
+        sizeBefore,
         sizeAfter: afterStats.size,
         sizeDelta,
       });
@@ -356,6 +820,10 @@ export function compareSnapshots(before: HeapSnapshot, after: HeapSnapshot): Com
   return data.sort((a, b) => b.sizeDelta - a.sizeDelta);
 }
 
+export function compareSnapshots(before: HeapSnapshot, after: HeapSnapshot): ComparisonRow[] {
+  return diffSummaries(summarizeSnapshot(before), summarizeSnapshot(after));
+}
+
 /**
  * FAST PATH: Compare snapshots without building full HeapSnapshot objects
  * For large heaps (>100MB), this is 10-50x faster than compareSnapshots()
@@ -367,104 +835,92 @@ export function compareSnapshots(before: HeapSnapshot, after: HeapSnapshot): Com
  *
  * @param beforePath - Path to baseline snapshot file
  * @param afterPath - Path to comparison snapshot file
+ * @param options - Set cacheSummary to reuse summaries across runs
  * @returns Comparison results sorted by size delta
  */
 export async function compareSnapshotsFast(
   beforePath: string,
   afterPath: string,
+  options: SummaryCacheOptions = {},
 ): Promise<ComparisonRow[]> {
   console.log("Fast comparison mode (skipping edges and retention paths)...\n");
 
   // Build summaries directly from raw data
   console.log("Processing baseline snapshot...");
-  const beforeSummary = await buildSummaryFromFile(beforePath);
+  const beforeSummary = await buildSummaryFromFile(beforePath, options);
 
   console.log("Processing comparison snapshot...");
-  const afterSummary = await buildSummaryFromFile(afterPath);
+  const afterSummary = await buildSummaryFromFile(afterPath, options);
 
   console.log("Computing differences...\n");
 
-  // Find all keys
-  const allKeys = new Set([...beforeSummary.keys(), ...afterSummary.keys()]);
-
-  const data: ComparisonRow[] = [];
-  for (const key of allKeys) {
-    const [nodeType, name] = key.split("|");
-    const beforeStats = beforeSummary.get(key) || { count: 0, size: 0 };
-    const afterStats = afterSummary.get(key) || { count: 0, size: 0 };
-
-    const countDelta = afterStats.count - beforeStats.count;
-    const sizeDelta = afterStats.size - beforeStats.size;
-
-    if (countDelta > 0 || sizeDelta > 0) {
-      data.push({
-        nodeType,
-        name,
-        countBefore: beforeStats.count,
-        countAfter: afterStats.count,
-        countDelta,
-        sizeBefore: beforeStats.size,
-        sizeAfter: afterStats.size,
-        sizeDelta,
-      });
-    }
-  }
-
-  return data.sort((a, b) => b.sizeDelta - a.sizeDelta);
+  return diffSummaries(beforeSummary, afterSummary);
 }
 
 /**
  * Build summary statistics directly from snapshot file
  * Skips creating HeapSnapshot instance (much faster for large heaps)
+ * Exported for heap_summary_worker.ts
  */
-async function buildSummaryFromFile(
+export async function buildSummaryFromFile(
   filePath: string,
-): Promise<Map<string, { count: number; size: number }>> {
+  options: SummaryCacheOptions = {},
+): Promise<TypeNameSummary> {
   const startTime = Date.now();
-  const fileSize = (await Deno.stat(filePath)).size;
+  const stat = await Deno.stat(filePath);
+  const fileSize = stat.size;
   console.log(`  File size: ${(fileSize / (1024 * 1024)).toFixed(1)} MB`);
 
+  if (options.cacheSummary) {
+    const cached = await readSummaryCache(filePath, stat);
+    if (cached) {
+      console.log(`  ✓ Using cached summary: ${cached.size} unique types\n`);
+      return cached;
+    }
+  }
+
   // Read and parse JSON
   console.log(`  Reading file...`);
   const jsonText = await Deno.readTextFile(filePath);
 
   console.log(`  Parsing JSON...`);
-  const data = JSON.parse(jsonText) as HeapSnapshotData;
+  const data = parseSnapshotJson(jsonText);
 
   console.log(`  Building summary...`);
 
-  const summary = new Map<string, { count: number; size: number }>();
-
   const meta = data.snapshot.meta;
   const nodeFields = meta.node_fields;
   const nodeTypes = meta.node_types[0];
   const strings = data.strings || [];
 
-  const typeIdx = nodeFields.indexOf("type");
-  const nameIdx = nodeFields.indexOf("name");
-  const selfSizeIdx = nodeFields.indexOf("self_size");
+  const {
+    type: typeIdx,
+    name: nameIdx,
+    self_size: selfSizeIdx,
+  } = resolveFieldOffsets(nodeFields, ["type", "name", "self_size"]);
   const nodeFieldCount = nodeFields.length;
 
   const nodesData = data.nodes;
   const nodeCount = nodesData.length / nodeFieldCount;
 
+  // Group on string-table indexes; names are only resolved once per group
+  const stride = strings.length + 1;
+  const groups = new Map<number, { count: number; size: number }>();
+
   // Process in batches for progress feedback
   const batchSize = 100000;
   let processed = 0;
 
   for (let i = 0; i < nodesData.length; i += nodeFieldCount) {
-    const type = nodeTypes[nodesData[i + typeIdx]];
-    const name = strings[nodesData[i + nameIdx]];
+    const key = nodesData[i + typeIdx] * stride + nodesData[i + nameIdx];
     const selfSize = nodesData[i + selfSizeIdx];
-
-    const key = `${type}|${name}`;
-    const stats = summary.get(key);
+    const stats = groups.get(key);
 
     if (stats) {
       stats.count++;
       stats.size += selfSize;
     } else {
-      summary.set(key, { count: 1, size: selfSize });
+      groups.set(key, { count: 1, size: selfSize });
     }
 
     processed++;
@@ -476,12 +932,80 @@ async function buildSummaryFromFile(
     }
   }
 
+  const summary = resolveTypeNameGroups(groups, stride, nodeTypes, strings);
+
   const elapsed = ((Date.now() - startTime) / 1000).toFixed(1);
   console.log(`  ✓ Summary complete: ${summary.size} unique types in ${elapsed}s\n`);
 
+  if (options.cacheSummary) {
+    await writeSummaryCache(filePath, stat, summary);
+  }
+
+  return summary;
+}
+
+function summaryCachePath(filePath: string): string {
+  return `${filePath}.summary.json`;
+}
+
+async function readSummaryCache(
+  filePath: string,
+  stat: Deno.FileInfo,
+): Promise<TypeNameSummary | null> {
+  let cache: SummaryCacheFile;
+  try {
+    cache = JSON.parse(await Deno.readTextFile(summaryCachePath(filePath)));
+  } catch {
+    return null; // Missing or unreadable; rebuild it
+  }
+
+  if (
+    cache?.version !== SUMMARY_CACHE_VERSION || cache.size !== stat.size ||
+    cache.mtimeMs !== (stat.mtime?.getTime() ?? null) || !Array.isArray(cache.entries)
+  ) {
+    return null;
+  }
+
+  const summary: TypeNameSummary = new Map();
+  for (const entry of cache.entries) {
+    if (!isSummaryCacheEntry(entry)) {
+      return null; // Damaged or hand-edited sidecar; rebuild it
+    }
+    const [nodeType, name, count, size] = entry;
+    summary.set(`${nodeType}|${name}`, { nodeType, name, count, size });
+  }
   return summary;
 }
 
+function isSummaryCacheEntry(entry: unknown): entry is SummaryCacheFile["entries"][number] {
+  return Array.isArray(entry) && entry.length === 4 &&
+    typeof entry[0] === "string" && typeof entry[1] === "string" &&
+    typeof entry[2] === "number" && typeof entry[3] === "number";
+}
+
+async function writeSummaryCache(
+  filePath: string,
+  stat: Deno.FileInfo,
+  summary: TypeNameSummary,
+): Promise<void> {
+  if (!stat.mtime) {
+    return; // No way to tell a stale sidecar apart
+  }
+
+  const cache: SummaryCacheFile = {
+    version: SUMMARY_CACHE_VERSION,
+    size: stat.size,
+    mtimeMs: stat.mtime.getTime(),
+    entries: Array.from(summary.values(), (e) => [e.nodeType, e.name, e.count, e.size]),
+  };
+  try {
+    await Deno.writeTextFile(summaryCachePath(filePath), JSON.stringify(cache));
+  } catch (err) {
+    // Caching is best-effort (e.g. read-only snapshot directory)
+    console.error(`  Could not write summary cache: ${err}`);
+  }
+}
+
 export function detectLeaks(
   snapshots: HeapSnapshot[],
   thresholdMB = 1.0,
@@ -490,16 +1014,136 @@ export function detectLeaks(
     return [];
   }
 
+  // Summarize each snapshot once; every middle snapshot takes part in two pairs
+  return detectLeaksInSummaries(snapshots.map(summarizeSnapshot), thresholdMB);
+}
+
+/**
+ * FAST PATH: detectLeaks() over snapshot files, summarizing each file without
+ * building HeapSnapshot objects. With cacheSummary, repeated runs (e.g. trying
+ * different thresholds) skip JSON parsing for files summarized before.
+ */
+export async function detectLeaksFromFiles(
+  snapshotPaths: string[],
+  thresholdMB = 1.0,
+  options: LeakDetectionOptions = {},
+): Promise<LeakCandidate[]> {
+  if (snapshotPaths.length < 2) {
+    return [];
+  }
+
+  const cacheOptions: SummaryCacheOptions = { cacheSummary: options.cacheSummary };
+  const concurrency = Math.min(options.concurrency ?? 1, snapshotPaths.length);
+
+  let summaries: TypeNameSummary[];
+  if (concurrency > 1) {
+    summaries = await summarizeFilesInWorkers(snapshotPaths, cacheOptions, concurrency);
+  } else {
+    summaries = [];
+    for (const path of snapshotPaths) {
+      console.log(`Processing ${path}...`);
+      summaries.push(await buildSummaryFromFile(path, cacheOptions));
+    }
+  }
+
+  return detectLeaksInSummaries(summaries, thresholdMB);
+}
+
+/**
+ * Summarize files on a small pool of Workers (see heap_summary_worker.ts).
+ * Each file is independent, so parsing runs on separate threads. The first
+ * failure stops handing out files and terminates the whole pool.
+ */
+async function summarizeFilesInWorkers(
+  paths: string[],
+  options: SummaryCacheOptions,
+  concurrency: number,
+): Promise<TypeNameSummary[]> {
+  type Pending = { resolve(summary: TypeNameSummary): void; reject(err: Error): void };
+  const summaries: TypeNameSummary[] = new Array(paths.length);
+  let next = 0;
+
+  const runWorker = async (worker: Worker) => {
+    // Handlers are installed once; a worker holds at most one request at a time.
+    // An error while idle is kept and thrown before the next file is handed out.
+    let pending: Pending | null = null;
+    let failure: Error | null = null;
+    const fail = (err: Error) => {
+      failure ??= err;
+      pending?.reject(err);
+      pending = null;
+    };
+    worker.onmessage = (event) => {
+      if (event.data.error) {
+        fail(new Error(event.data.error));
+      } else {
+        pending?.resolve(event.data.summary);
+        pending = null;
+      }
+    };
+    worker.onerror = (event) => {
+      event.preventDefault();
+      fail(new Error(event.message));
+    };
+
+    while (next < paths.length) {
+      if (failure) {
+        throw failure;
+      }
+      const index = next++;
+      console.log(`Processing ${paths[index]}...`);
+      summaries[index] = await new Promise<TypeNameSummary>((resolve, reject) => {
+        pending = { resolve, reject };
+        worker.postMessage({ path: paths[index], options });
+      });
+    }
+  };
+
+  const workerUrl = new URL("./heap_summary_worker.ts", import.meta.url).href;
+  const workers = Array.from(
+    { length: concurrency },
+    () => new Worker(workerUrl, { type: "module" }),
+  );
+  try {
+    await Promise.all(workers.map(runWorker));
+  } catch (err) {
+    next = paths.length; // Stop handing out files; in-flight requests end with their workers
+    throw err;
+  } finally {
+    for (const worker of workers) {
+      worker.terminate();
+    }
+  }
+  return summaries;
+}
+
+function detectLeaksInSummaries(
+  summaries: TypeNameSummary[],
+  thresholdMB: number,
+): LeakCandidate[] {
   // Track growth trends
-  const growthTrends = new Map<string, number[]>();
+  const growthTrends = new Map<
+    string,
+    { nodeType: string; name: string; totalGrowth: number; pairs: number; allGrowing: boolean }
+  >();
 
-  for (let i = 0; i < snapshots.length - 1; i++) {
-    const comparison = compareSnapshots(snapshots[i], snapshots[i + 1]);
-    for (const row of comparison) {
+  for (let i = 0; i < summaries.length - 1; i++) {
+    for (const row of diffSummaries(summaries[i], summaries[i + 1])) {
       const key = `${row.nodeType}|${row.name}`;
-      const deltas = growthTrends.get(key) || [];
-      deltas.push(row.sizeDelta);
-      growthTrends.set(key, deltas);
+      const trend = growthTrends.get(key);
+      if (trend) {
+        trend.totalGrowth += row.sizeDelta;
+        trend.pairs++;
+        trend.allGrowing &&= row.sizeDelta > 0;
+      } else {
+        growthTrends.set(key, {
+          nodeType: row.nodeType,
+          name: row.name,
+          totalGrowth: row.sizeDelta,
+          pairs: 1,
+          allGrowing: row.sizeDelta > 0,
+        });
+      }
     }
   }
 
@@ -507,20 +1151,16 @@ export function detectLeaks(
   const leaks: LeakCandidate[] = [];
   const thresholdBytes = thresholdMB * 1024 * 1024;
 
-  for (const [key, deltas] of growthTrends.entries()) {
+  for (const trend of growthTrends.values()) {
     // Check if consistently growing
-    if (deltas.every((d) => d > 0)) {
-      const totalGrowth = deltas.reduce((sum, d) => sum + d, 0);
-      if (totalGrowth > thresholdBytes) {
-        const [nodeType, name] = key.split("|");
-        leaks.push({
-          nodeType,
-          name,
-          totalGrowthMB: totalGrowth / (1024 * 1024),
-          growthPerSnapshotMB: (totalGrowth / deltas.length) / (1024 * 1024),
-          snapshotsGrowing: deltas.length,
-        });
-      }
+    if (trend.allGrowing && trend.totalGrowth > thresholdBytes) {
+      leaks.push({
+        nodeType: trend.nodeType,
+        name: trend.name,
+        totalGrowthMB: trend.totalGrowth / (1024 * 1024),
+        growthPerSnapshotMB: (trend.totalGrowth / trend.pairs) / (1024 * 1024),
+        snapshotsGrowing: trend.pairs,
+      });
     }
   }
 
@@ -528,21 +1168,68 @@ export function detectLeaks(
 }
 
 export function findLargestObjects(snapshot: HeapSnapshot, limit = 20): LargestObject[] {
-  const data: LargestObject[] = [];
+  const sizes = snapshot.nodeSelfSize;
+  let top: number[] = [];
+
+  // Largest first; equal sizes keep node order
+  const byRank = (a: number, b: number) => sizes[b] - sizes[a] || a - b;
+
+  if (limit <= TOP_K_HEAP_LIMIT) {
+    // Bounded min-heap of the best `limit` ordinals seen so far, with the
+    // weakest at the root: O(N log K) whatever order the sizes arrive in.
+    // Ordinals only increase, so a node that merely ties the root never
+    // outranks it.
+    const weaker = (a: number, b: number) => byRank(a, b) > 0;
+    const siftDown = (i: number) => {
+      for (;;) {
+        const left = 2 * i + 1;
+        const right = left + 1;
+        let weakest = i;
+        if (left < top.length && weaker(top[left], top[weakest])) weakest = left;
+        if (right < top.length && weaker(top[right], top[weakest])) weakest = right;
+        if (weakest === i) return;
+        [top[i], top[weakest]] = [top[weakest], top[i]];
+        i = weakest;
+      }
+    };
 
-  for (const node of snapshot.nodes) {
-    if (node.self_size > 0) {
-      data.push({
-        nodeId: node.id,
-        nodeType: node.type,
-        name: node.name,
-        sizeBytes: node.self_size,
-        sizeMB: node.self_size / (1024 * 1024),
-      });
+    for (let n = 0; n < snapshot.nodeCount; n++) {
+      const size = sizes[n];
+      if (size <= 0) {
+        continue;
+      }
+      if (top.length < limit) {
+        // Sift up
+        let i = top.push(n) - 1;
+        while (i > 0) {
+          const parent = (i - 1) >> 1;
+          if (!weaker(top[i], top[parent])) break;
+          [top[i], top[parent]] = [top[parent], top[i]];
+          i = parent;
+        }
+      } else if (limit > 0 && size > sizes[top[0]]) {
+        top[0] = n;
+        siftDown(0);
+      }
+    }
+    top.sort(byRank);
+  } else {
+    for (let n = 0; n < snapshot.nodeCount; n++) {
+      if (sizes[n] > 0) {
+        top.push(n);
+      }
     }
+    top = top.sort(byRank).slice(0, limit);
   }
 
-  return data.sort((a, b) => b.sizeBytes - a.sizeBytes).slice(0, limit);
+  // Only the selected rows are materialized
+  return top.map((n) => ({
+    nodeId: snapshot.nodeIds[n],
+    nodeType: snapshot.getNodeType(n),
+    name: snapshot.getNodeName(n),
+    sizeBytes: sizes[n],
+    sizeMB: sizes[n] / (1024 * 1024),
+  }));
 }
 
 // ============================================================================
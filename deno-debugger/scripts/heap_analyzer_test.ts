@@ -0,0 +1,368 @@
+/**
+ * Tests for heap snapshot analysis
+ */
+
+import {
+  assertEquals,
+  assertExists,
+  assertRejects,
+  assertThrows,
+} from "https://deno.land/std@0.224.0/assert/mod.ts";
+import {
+  compareSnapshots,
+  compareSnapshotsFast,
+  detectLeaks,
+  detectLeaksFromFiles,
+  findLargestObjects,
+  HeapSnapshot,
+} from "./heap_analyzer.ts";
+import type { HeapSnapshotData } from "./types.ts";
+
+const NODE_TYPES = ["hidden", "array", "string", "object", "code", "closure", "synthetic"];
+const EDGE_TYPES = ["context", "element", "property", "internal", "hidden", "shortcut", "weak"];
+
+// (GC roots) -> global -> Leaky, plus an unreachable string
+function makeSnapshotData(extraLeaky = 0): HeapSnapshotData {
+  const nodes = [
+    [6, 1, 1, 0, 1, 0], // synthetic "(GC roots)"
+    [3, 3, 3, 100, 1, 0], // object "global"
+    [3, 2, 5, 500, 0, 0], // object "Leaky"
+    [2, 5, 7, 50, 0, 0], // string "Other"
+  ].flat();
+  for (let i = 0; i < extraLeaky; i++) {
+    nodes.push(3, 2, 9 + i * 2, 500, 0, 0);
+  }
+
+  return {
+    snapshot: {
+      meta: {
+        node_fields: ["type", "name", "id", "self_size", "edge_count", "trace_node_id"],
+        node_types: [NODE_TYPES],
+        edge_fields: ["type", "name_or_index", "to_node"],
+        edge_types: [EDGE_TYPES],
+      },
+      node_count: nodes.length / 6,
+      edge_count: 2,
+    },
+    nodes,
+    edges: [
+      [2, 3, 6], // (GC roots) -[global]-> global
+      [2, 4, 12], // global -[items]-> Leaky
+    ].flat(),
+    strings: ["", "(GC roots)", "Leaky", "global", "items", "Other"],
+  };
+}
+
+Deno.test("HeapSnapshot - parses nodes", () => {
+  const snapshot = new HeapSnapshot(makeSnapshotData());
+  assertEquals(snapshot.nodes.length, 4);
+  assertEquals(snapshot.nodes[2], {
+    type: "object",
+    name: "Leaky",
+    id: 5,
+    self_size: 500,
+    edge_count: 0,
+    trace_node_id: 0,
+    index: 12,
+  });
+  assertEquals(snapshot.nodeById.get(7)?.name, "Other");
+});
+
+Deno.test("HeapSnapshot - tolerates missing optional fields and rejects missing required ones", () => {
+  const data = makeSnapshotData();
+  const fields = data.snapshot.meta.node_fields;
+  // Drop trace_node_id (last column) from every row
+  data.nodes = data.nodes.filter((_, i) => i % fields.length !== fields.length - 1);
+  data.snapshot.meta.node_fields = fields.slice(0, -1);
+
+  const snapshot = new HeapSnapshot(data);
+  assertEquals(snapshot.getNodesByName("Leaky")[0].trace_node_id, 0);
+  assertEquals(snapshot.getNodesByName("Leaky")[0].self_size, 500);
+
+  const broken = makeSnapshotData();
+  broken.snapshot.meta.node_fields = broken.snapshot.meta.node_fields.map((f) =>
+    f === "id" ? "node_id" : f
+  );
+  assertThrows(() => new HeapSnapshot(broken), Error, 'missing "id"');
+});
+
+Deno.test("HeapSnapshot - parses edges with source nodes", () => {
+  const snapshot = new HeapSnapshot(makeSnapshotData());
+  assertEquals(snapshot.edges.length, 2);
+  assertEquals(snapshot.edges[1], {
+    type: "property",
+    name_or_index: "items",
+    to_node: 12,
+    from_node: 3,
+  });
+});
+
+Deno.test("HeapSnapshot - getNodesByType and getNodesByName filter", () => {
+  const snapshot = new HeapSnapshot(makeSnapshotData(2));
+  assertEquals(snapshot.getNodesByType("object").length, 4);
+  assertEquals(snapshot.getNodesByType("closure").length, 0);
+  assertEquals(snapshot.getNodesByName("Leaky").map((n) => n.id), [5, 9, 11]);
+});
+
+Deno.test("HeapSnapshot - getNodeSizeSummary groups by type", () => {
+  const snapshot = new HeapSnapshot(makeSnapshotData());
+  assertEquals(snapshot.getNodeSizeSummary(), [
+    { nodeType: "object", count: 2, totalSize: 600, avgSize: 300 },
+    { nodeType: "string", count: 1, totalSize: 50, avgSize: 50 },
+    { nodeType: "synthetic", count: 1, totalSize: 0, avgSize: 0 },
+  ]);
+
+  // Callers get their own copy of the memoized summary
+  const edited = snapshot.getNodeSizeSummary();
+  edited[0].count = 99;
+  edited.reverse();
+  assertEquals(snapshot.getNodeSizeSummary()[0], {
+    nodeType: "object",
+    count: 2,
+    totalSize: 600,
+    avgSize: 300,
+  });
+});
+
+Deno.test("HeapSnapshot - findRetainingPath walks back to GC roots", () => {
+  const snapshot = new HeapSnapshot(makeSnapshotData());
+  const path = snapshot.findRetainingPath(5);
+  assertExists(path);
+  assertEquals(path.distance, 2);
+  assertEquals(path.path.map((step) => step.node.name), ["(GC roots)", "global"]);
+  assertEquals(path.path.map((step) => step.edge.name_or_index), ["global", "items"]);
+
+  assertEquals(snapshot.findRetainingPath(7), null);
+  assertEquals(snapshot.findRetainingPath(5, 1), null);
+  assertEquals(snapshot.findRetainingPath(5, 2)?.distance, 2);
+  assertEquals(snapshot.findRetainingPath(1)?.distance, 0);
+});
+
+Deno.test("HeapSnapshot - findRetainingPath reuses results for repeated queries", () => {
+  const snapshot = new HeapSnapshot(makeSnapshotData());
+  const first = snapshot.findRetainingPath(5);
+  assertExists(first);
+  assertEquals(snapshot.findRetainingPath(5), first);
+  assertEquals(snapshot.findRetainingPath(5, 1), null);
+});
+
+Deno.test("HeapSnapshot - findRetainingPath results can be edited without affecting the cache", () => {
+  const snapshot = new HeapSnapshot(makeSnapshotData());
+  const first = snapshot.findRetainingPath(5);
+  assertExists(first);
+  first.path[0].node.name = "edited";
+  first.path[0].edge.name_or_index = "edited";
+  first.path.pop();
+  first.distance = 0;
+
+  const second = snapshot.findRetainingPath(5);
+  assertExists(second);
+  assertEquals(second.distance, 2);
+  assertEquals(second.path.map((step) => step.node.name), ["(GC roots)", "global"]);
+  assertEquals(second.path.map((step) => step.edge.name_or_index), ["global", "items"]);
+});
+
+Deno.test("HeapSnapshot - retainer index maps targets to their retainers", () => {
+  const snapshot = new HeapSnapshot(makeSnapshotData());
+  assertEquals(Array.from(snapshot.retainerOffsets), [0, 0, 1, 2, 2]);
+  assertEquals(Array.from(snapshot.retainerNodes), [0, 1]);
+
+  const retainers = snapshot.retainedBy.get(5);
+  assertExists(retainers);
+  assertEquals(retainers.map(([id, edge]) => [id, edge.name_or_index]), [[3, "items"]]);
+  assertEquals(snapshot.retainedBy.has(7), false);
+});
+
+Deno.test("HeapSnapshot - skipEdges parses nodes only", () => {
+  const snapshot = new HeapSnapshot(makeSnapshotData(), { skipEdges: true });
+  assertEquals(snapshot.nodes.length, 4);
+  assertEquals(snapshot.edges.length, 0);
+});
+
+Deno.test("compareSnapshots - reports growth by type and name", () => {
+  const before = new HeapSnapshot(makeSnapshotData());
+  const after = new HeapSnapshot(makeSnapshotData(3));
+
+  assertEquals(compareSnapshots(before, after), [{
+    nodeType: "object",
+    name: "Leaky",
+    countBefore: 1,
+    countAfter: 4,
+    countDelta: 3,
+    sizeBefore: 500,
+    sizeAfter: 2000,
+    sizeDelta: 1500,
+  }]);
+});
+
+Deno.test("compareSnapshots - keeps names containing the key separator intact", () => {
+  const beforeData = makeSnapshotData();
+  const afterData = makeSnapshotData(1);
+  beforeData.strings[2] = afterData.strings[2] = "Map|Set";
+
+  const rows = compareSnapshots(new HeapSnapshot(beforeData), new HeapSnapshot(afterData));
+  assertEquals(rows.map((r) => [r.nodeType, r.name]), [["object", "Map|Set"]]);
+});
+
+Deno.test("compareSnapshotsFast - matches compareSnapshots", async () => {
+  const dir = await Deno.makeTempDir();
+  try {
+    await Deno.writeTextFile(`${dir}/before.heapsnapshot`, JSON.stringify(makeSnapshotData()));
+    await Deno.writeTextFile(`${dir}/after.heapsnapshot`, JSON.stringify(makeSnapshotData(3)));
+
+    const fast = await compareSnapshotsFast(
+      `${dir}/before.heapsnapshot`,
+      `${dir}/after.heapsnapshot`,
+    );
+    const full = compareSnapshots(
+      new HeapSnapshot(makeSnapshotData()),
+      new HeapSnapshot(makeSnapshotData(3)),
+    );
+    assertEquals(fast, full);
+  } finally {
+    await Deno.remove(dir, { recursive: true });
+  }
+});
+
+Deno.test("detectLeaks - flags consistent growth above threshold", () => {
+  const snapshots = [0, 1000, 2000].map((n) => new HeapSnapshot(makeSnapshotData(n)));
+  const leaks = detectLeaks(snapshots, 0.5);
+
+  assertEquals(leaks.length, 1);
+  assertEquals(leaks[0].name, "Leaky");
+  assertEquals(leaks[0].snapshotsGrowing, 2);
+  assertEquals(leaks[0].totalGrowthMB, (2000 * 500) / (1024 * 1024));
+});
+
+Deno.test("detectLeaksFromFiles - matches detectLeaks and reuses cached summaries", async () => {
+  const dir = await Deno.makeTempDir();
+  try {
+    const growth = [0, 1000, 2000];
+    const paths = growth.map((_, i) => `${dir}/snap_${i}.heapsnapshot`);
+    for (let i = 0; i < growth.length; i++) {
+      await Deno.writeTextFile(paths[i], JSON.stringify(makeSnapshotData(growth[i])));
+    }
+
+    const expected = detectLeaks(growth.map((n) => new HeapSnapshot(makeSnapshotData(n))), 0.5);
+    assertEquals(await detectLeaksFromFiles(paths, 0.5, { cacheSummary: true }), expected);
+
+    // Second run reads the sidecars; prove it by editing one
+    const sidecar = JSON.parse(await Deno.readTextFile(`${paths[2]}.summary.json`));
+    for (const entry of sidecar.entries) {
+      if (entry[1] === "Leaky") entry[3] *= 2;
+    }
+    await Deno.writeTextFile(`${paths[2]}.summary.json`, JSON.stringify(sidecar));
+
+    const cached = await detectLeaksFromFiles(paths, 0.5, { cacheSummary: true });
+    assertEquals(cached[0].totalGrowthMB > expected[0].totalGrowthMB, true);
+  } finally {
+    await Deno.remove(dir, { recursive: true });
+  }
+});
+
+Deno.test("detectLeaksFromFiles - rebuilds malformed cached summaries", async () => {
+  const dir = await Deno.makeTempDir();
+  try {
+    const growth = [0, 1000, 2000];
+    const paths = growth.map((_, i) => `${dir}/snap_${i}.heapsnapshot`);
+    for (let i = 0; i < growth.length; i++) {
+      await Deno.writeTextFile(paths[i], JSON.stringify(makeSnapshotData(growth[i])));
+    }
+    const expected = await detectLeaksFromFiles(paths, 0.5, { cacheSummary: true });
+
+    const sidecarPath = `${paths[2]}.summary.json`;
+    const sidecar = JSON.parse(await Deno.readTextFile(sidecarPath));
+    for (const entries of [null, {}, [["object", "Leaky", 1]], [["object", "Leaky", "1", 2]]]) {
+      await Deno.writeTextFile(sidecarPath, JSON.stringify({ ...sidecar, entries }));
+      assertEquals(await detectLeaksFromFiles(paths, 0.5, { cacheSummary: true }), expected);
+    }
+    await Deno.writeTextFile(sidecarPath, "null");
+    assertEquals(await detectLeaksFromFiles(paths, 0.5, { cacheSummary: true }), expected);
+  } finally {
+    await Deno.remove(dir, { recursive: true });
+  }
+});
+
+Deno.test("detectLeaksFromFiles - summarizes files in parallel workers", async () => {
+  const dir = await Deno.makeTempDir();
+  try {
+    const growth = [0, 500, 1000, 2000];
+    const paths = growth.map((_, i) => `${dir}/snap_${i}.heapsnapshot`);
+    for (let i = 0; i < growth.length; i++) {
+      await Deno.writeTextFile(paths[i], JSON.stringify(makeSnapshotData(growth[i])));
+    }
+
+    assertEquals(
+      await detectLeaksFromFiles(paths, 0.5, { concurrency: 3 }),
+      await detectLeaksFromFiles(paths, 0.5),
+    );
+  } finally {
+    await Deno.remove(dir, { recursive: true });
+  }
+});
+
+Deno.test("detectLeaksFromFiles - a failing file stops the worker pool", async () => {
+  const dir = await Deno.makeTempDir();
+  const log = console.log;
+  const processed: string[] = [];
+  try {
+    const paths = [`${dir}/missing.heapsnapshot`];
+    for (let i = 0; i < 6; i++) {
+      paths.push(`${dir}/snap_${i}.heapsnapshot`);
+      await Deno.writeTextFile(paths[i + 1], JSON.stringify(makeSnapshotData(i * 100)));
+    }
+
+    console.log = (message?: unknown) => processed.push(String(message));
+    await assertRejects(() => detectLeaksFromFiles(paths, 0.5, { concurrency: 2 }));
+    const handedOut = processed.length;
+
+    // Nothing more is handed out once the call has failed
+    await new Promise((resolve) => setTimeout(resolve, 200));
+    assertEquals(processed.length, handedOut);
+    assertEquals(handedOut < paths.length, true);
+  } finally {
+    console.log = log;
+    await Deno.remove(dir, { recursive: true });
+  }
+});
+
+Deno.test("findLargestObjects - returns biggest nodes first", () => {
+  const snapshot = new HeapSnapshot(makeSnapshotData());
+  const largest = findLargestObjects(snapshot, 2);
+  assertEquals(largest.map((o) => o.name), ["Leaky", "global"]);
+  assertEquals(largest[0].sizeBytes, 500);
+
+  // Ties keep node order; zero-sized nodes are never reported
+  const grown = new HeapSnapshot(makeSnapshotData(3));
+  assertEquals(findLargestObjects(grown, 5000).map((o) => o.nodeId), [5, 9, 11, 13, 3, 7]);
+  assertEquals(findLargestObjects(grown, 3).map((o) => o.nodeId), [5, 9, 11]);
+});
+
+Deno.test("findLargestObjects - ascending sizes match a full sort, ties in node order", () => {
+  // Every node outranks the ones before it (the bounded heap's worst case),
+  // and pairs of equal sizes exercise the tie-break
+  const count = 5000;
+  const nodes: number[] = [];
+  for (let i = 0; i < count; i++) {
+    nodes.push(3, 2, i + 1, Math.floor(i / 2) + 1, 0, 0);
+  }
+  const data = makeSnapshotData();
+  data.nodes = nodes;
+  data.edges = [];
+  data.snapshot.node_count = count;
+  data.snapshot.edge_count = 0;
+  const snapshot = new HeapSnapshot(data);
+
+  // The previous implementation: stable sort by size, largest first
+  const reference = (limit: number) =>
+    Array.from({ length: count }, (_, n) => n)
+      .sort((a, b) => snapshot.nodeSelfSize[b] - snapshot.nodeSelfSize[a])
+      .slice(0, limit)
+      .map((n) => snapshot.nodeIds[n]);
+
+  for (const limit of [1, 3, 20, 999, 1000, 1001]) {
+    assertEquals(findLargestObjects(snapshot, limit).map((o) => o.nodeId), reference(limit));
+  }
+  assertEquals(findLargestObjects(snapshot, 3).map((o) => o.nodeId), [4999, 5000, 4997]);
+  assertEquals(findLargestObjects(snapshot, 0), []);
+});
@@ -0,0 +1,25 @@
+/// <reference no-default-lib="true" />
+/// <reference lib="deno.worker" />
+
+/**
+ * Worker entry point for detectLeaksFromFiles({ concurrency }).
+ *
+ * Summarizes one heap snapshot file per message so several large snapshots
+ * can be parsed on separate threads.
+ */
+
+import { buildSummaryFromFile, type SummaryCacheOptions } from "./heap_analyzer.ts";
+
+interface SummaryRequest {
+  path: string;
+  options: SummaryCacheOptions;
+}
+
+self.onmessage = async (event: MessageEvent<SummaryRequest>) => {
+  try {
+    const summary = await buildSummaryFromFile(event.data.path, event.data.options);
+    self.postMessage({ summary });
+  } catch (err) {
+    self.postMessage({ error: err instanceof Error ? err.message : String(err) });
+  }
+};
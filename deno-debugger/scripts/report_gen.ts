@@ -33,33 +33,104 @@ export interface ReportSection {
   level: number;
 }
 
+/** One entry in a report; the `type` tag selects its renderer */
+type Section =
+  | { type: "summary"; content: string }
+  | { type: "problem"; content: string }
+  | { type: "timeline"; breadcrumbs: Breadcrumbs }
+  | { type: "custom"; heading: string; content: string; level: number }
+  | ({ type: "code" } & CodeSnippet)
+  | ({ type: "finding" } & Finding)
+  | { type: "root_cause"; cause: string; explanation: string }
+  | { type: "fix"; recommendation: string; code?: CodeSnippet }
+  | { type: "table"; caption: string; rows: Array<Record<string, unknown>> };
+
+type SectionType = Section["type"];
+type SectionOf<T extends SectionType> = Extract<Section, { type: T }>;
+type SectionRenderer<S extends Section = Section> = (section: S, out: string[]) => void;
+
+/** Copy a finding into a fixed shape so renderFinding always sees the same object layout */
+function findingSection(finding: Finding): SectionOf<"finding"> {
+  return {
+    type: "finding",
+    description: finding.description,
+    severity: finding.severity,
+    details: finding.details,
+    evidence: finding.evidence,
+  };
+}
+
+/** Heading icon for each finding severity */
+const SEVERITY_ICONS: Readonly<Record<string, string>> = {
+  info: "ℹ️",
+  warning: "⚠️",
+  critical: "🔴",
+};
+
+const ENCODER = new TextEncoder();
+
+/** writeTo() flushes once this many encoded bytes are pending */
+const WRITE_CHUNK_BYTES = 64 * 1024;
+
+/** Join encoded chunks into one buffer (returned as-is when there is only one) */
+function concatBytes(parts: Uint8Array[], totalBytes: number): Uint8Array {
+  if (parts.length === 1) {
+    return parts[0];
+  }
+  const result = new Uint8Array(totalBytes);
+  let offset = 0;
+  for (const part of parts) {
+    result.set(part, offset);
+    offset += part.length;
+  }
+  return result;
+}
+
+let numberFormat: Intl.NumberFormat | undefined;
+
+/**
+ * Shared formatter for numeric table cells (same output as toLocaleString()).
+ * Created on first use so importing this module does not load locale data.
+ */
+function formatNumber(value: number): string {
+  numberFormat ??= new Intl.NumberFormat();
+  return numberFormat.format(value);
+}
+
 export class MarkdownReport {
   private title: string;
   private breadcrumbs?: Breadcrumbs;
-  private sections: Array<{
-    type: string;
-    data: unknown;
-  }> = [];
+  private sections: Section[] = [];
   private createdAt: Date;
+  /** "YYYY-MM-DD HH:MM:SS" form of createdAt, formatted once for every generate() */
+  private readonly createdAtDisplay: string;
+
+  /** Section type -> renderer; built once per report instead of a per-section switch */
+  private readonly renderers: { [T in SectionType]: SectionRenderer<SectionOf<T>> } = {
+    summary: (section, out) => this.renderSummary(section, out),
+    problem: (section, out) => this.renderProblem(section, out),
+    timeline: (section, out) => this.renderTimeline(section, out),
+    custom: (section, out) => this.renderCustomSection(section, out),
+    code: (section, out) => this.renderCodeSnippet(section, out),
+    finding: (section, out) => this.renderFinding(section, out),
+    root_cause: (section, out) => this.renderRootCause(section, out),
+    fix: (section, out) => this.renderFix(section, out),
+    table: (section, out) => this.renderDataTable(section, out),
+  };
 
   constructor(title: string, breadcrumbs?: Breadcrumbs) {
     this.title = title;
     this.breadcrumbs = breadcrumbs;
     this.createdAt = new Date();
+    this.createdAtDisplay = this.createdAt.toISOString().replace("T", " ").substring(0, 19);
   }
 
   addSummary(text: string): void {
-    this.sections.push({
-      type: "summary",
-      data: { content: text },
-    });
+    this.sections.push({ type: "summary", content: text });
   }
 
   addProblem(description: string): void {
-    this.sections.push({
-      type: "problem",
-      data: { content: description },
-    });
+    this.sections.push({ type: "problem", content: description });
   }
 
   addTimeline(): void {
@@ -67,17 +138,11 @@ export class MarkdownReport {
       return;
     }
 
-    this.sections.push({
-      type: "timeline",
-      data: { breadcrumbs: this.breadcrumbs },
-    });
+    this.sections.push({ type: "timeline", breadcrumbs: this.breadcrumbs });
   }
 
   addSection(heading: string, content: string, level = 2): void {
-    this.sections.push({
-      type: "custom",
-      data: { heading, content, level },
-    });
+    this.sections.push({ type: "custom", heading, content, level });
   }
 
   addCodeSnippet(
@@ -86,262 +151,231 @@ export class MarkdownReport {
     caption?: string,
     filePath?: string,
   ): void {
-    this.sections.push({
-      type: "code",
-      data: { language, code, caption, filePath },
-    });
+    this.sections.push({ type: "code", language, code, caption, filePath });
   }
 
   addFinding(finding: Finding): void {
-    this.sections.push({
-      type: "finding",
-      data: finding,
-    });
+    this.sections.push(findingSection(finding));
+  }
+
+  /** Add many findings at once, e.g. ones derived from breadcrumbs */
+  addFindings(findings: Finding[]): void {
+    const sections = this.sections;
+    for (let i = 0; i < findings.length; i++) {
+      sections.push(findingSection(findings[i]));
+    }
   }
 
   addRootCause(cause: string, explanation: string): void {
-    this.sections.push({
-      type: "root_cause",
-      data: { cause, explanation },
-    });
+    this.sections.push({ type: "root_cause", cause, explanation });
   }
 
   addFix(recommendation: string, code?: CodeSnippet): void {
     this.sections.push({
       type: "fix",
-      data: { recommendation, code },
+      recommendation,
+      code: code
+        ? {
+          language: code.language,
+          code: code.code,
+          caption: code.caption,
+          filePath: code.filePath,
+        }
+        : undefined,
     });
   }
 
   addDataTable(caption: string, data: Array<Record<string, unknown>>): void {
-    this.sections.push({
-      type: "table",
-      data: { caption, rows: data },
-    });
+    this.sections.push({ type: "table", caption, rows: data });
   }
 
   generate(): string {
-    const lines: string[] = [];
+    // Every renderer appends to the same output buffer, joined once at the end
+    const out: string[] = [];
+    this.renderHeader(out);
+    for (const section of this.sections) {
+      this.renderSection(section, out);
+    }
+    return out.join("\n");
+  }
 
-    // Title
-    lines.push(`# ${this.title}`);
-    lines.push(`*Generated: ${this.createdAt.toISOString().replace("T", " ").substring(0, 19)}*`);
-    lines.push("");
+  /**
+   * Stream the report to `writable` in chunks of roughly WRITE_CHUNK_BYTES,
+   * so the full text is never held in memory at once. Closes `writable`.
+   */
+  async writeTo(writable: WritableStream<Uint8Array>): Promise<void> {
+    const writer = writable.getWriter();
+    try {
+      const pending: Uint8Array[] = [];
+      let pendingBytes = 0;
+      for (const bytes of this.encodedChunks()) {
+        pending.push(bytes);
+        pendingBytes += bytes.length;
+        if (pendingBytes >= WRITE_CHUNK_BYTES) {
+          await writer.write(concatBytes(pending, pendingBytes));
+          pending.length = 0;
+          pendingBytes = 0;
+        }
+      }
 
-    // Process sections
-    for (const section of this.sections) {
-      switch (section.type) {
-        case "summary":
-          lines.push(...this.renderSummary(section.data as { content: string }));
-          break;
-        case "problem":
-          lines.push(...this.renderProblem(section.data as { content: string }));
-          break;
-        case "timeline":
-          lines.push(...this.renderTimeline(section.data as { breadcrumbs: Breadcrumbs }));
-          break;
-        case "custom":
-          lines.push(
-            ...this.renderCustomSection(
-              section.data as { heading: string; content: string; level: number },
-            ),
-          );
-          break;
-        case "code":
-          lines.push(
-            ...this.renderCodeSnippet(
-              section.data as {
-                language: string;
-                code: string;
-                caption?: string;
-                filePath?: string;
-              },
-            ),
-          );
-          break;
-        case "finding":
-          lines.push(...this.renderFinding(section.data as Finding));
-          break;
-        case "root_cause":
-          lines.push(
-            ...this.renderRootCause(section.data as { cause: string; explanation: string }),
-          );
-          break;
-        case "fix":
-          lines.push(
-            ...this.renderFix(section.data as { recommendation: string; code?: CodeSnippet }),
-          );
-          break;
-        case "table":
-          lines.push(
-            ...this.renderDataTable(
-              section.data as { caption: string; rows: Array<Record<string, unknown>> },
-            ),
-          );
-          break;
+      if (pendingBytes > 0) {
+        await writer.write(concatBytes(pending, pendingBytes));
       }
-      lines.push("");
+      await writer.close();
+    } catch (error) {
+      await writer.abort(error);
+      throw error;
     }
+  }
 
-    return lines.join("\n");
+  /** UTF-8 encoded report, identical to encoding generate() but without the full string */
+  generateBytes(): Uint8Array {
+    const parts: Uint8Array[] = [];
+    let totalBytes = 0;
+    for (const bytes of this.encodedChunks()) {
+      parts.push(bytes);
+      totalBytes += bytes.length;
+    }
+    return concatBytes(parts, totalBytes);
   }
 
-  private renderSummary(data: { content: string }): string[] {
-    return [
-      "## Summary",
-      "",
-      data.content,
-      "",
-    ];
+  /**
+   * Header, then each section, encoded as soon as it is rendered so emoji-bearing
+   * lines never widen one large pending string.
+   */
+  private *encodedChunks(): Generator<Uint8Array> {
+    const out: string[] = [];
+    this.renderHeader(out);
+    yield ENCODER.encode(out.join("\n"));
+    for (const section of this.sections) {
+      out.length = 0;
+      this.renderSection(section, out);
+      yield ENCODER.encode("\n" + out.join("\n"));
+    }
   }
 
-  private renderProblem(data: { content: string }): string[] {
-    return [
-      "## Problem",
-      "",
-      data.content,
-      "",
-    ];
+  private renderHeader(out: string[]): void {
+    out.push(`# ${this.title}`, `*Generated: ${this.createdAtDisplay}*`, "");
   }
 
-  private renderTimeline(data: { breadcrumbs: Breadcrumbs }): string[] {
-    return [
-      "## Investigation Timeline",
-      "",
-      ...data.breadcrumbs.toMarkdownTimeline().split("\n").slice(3), // Skip title
-      "",
-    ];
+  private renderSection(section: Section, out: string[]): void {
+    (this.renderers[section.type] as SectionRenderer)(section, out);
+    out.push("");
   }
 
-  private renderCustomSection(data: { heading: string; content: string; level: number }): string[] {
-    const prefix = "#".repeat(data.level);
-    return [
-      `${prefix} ${data.heading}`,
-      "",
-      data.content,
-      "",
-    ];
+  private renderSummary(section: SectionOf<"summary">, out: string[]): void {
+    out.push("## Summary", "", section.content, "");
   }
 
-  private renderCodeSnippet(
-    data: { language: string; code: string; caption?: string; filePath?: string },
-  ): string[] {
-    const lines: string[] = [];
+  private renderProblem(section: SectionOf<"problem">, out: string[]): void {
+    out.push("## Problem", "", section.content, "");
+  }
 
-    if (data.caption) {
-      lines.push(`**${data.caption}**`);
-      lines.push("");
+  private renderTimeline(section: SectionOf<"timeline">, out: string[]): void {
+    out.push("## Investigation Timeline", "");
+    const timeline = section.breadcrumbs.toMarkdownTimeline().split("\n");
+    for (let i = 3; i < timeline.length; i++) { // Skip title
+      out.push(timeline[i]);
     }
+    out.push("");
+  }
 
-    if (data.filePath) {
-      lines.push(`File: \`${data.filePath}\``);
-      lines.push("");
+  private renderCustomSection(section: SectionOf<"custom">, out: string[]): void {
+    const prefix = "#".repeat(section.level);
+    out.push(`${prefix} ${section.heading}`, "", section.content, "");
+  }
+
+  private renderCodeSnippet(data: CodeSnippet, out: string[]): void {
+    const { caption, filePath } = data;
+    if (caption) {
+      out.push(`**${caption}**`, "");
     }
 
-    lines.push(`\`\`\`${data.language}`);
-    lines.push(data.code);
-    lines.push("```");
-    lines.push("");
+    if (filePath) {
+      out.push(`File: \`${filePath}\``, "");
+    }
 
-    return lines;
+    // Fenced block from one template instead of four separate lines
+    out.push(`\`\`\`${data.language}\n${data.code}\n\`\`\``, "");
   }
 
-  private renderFinding(finding: Finding): string[] {
-    const lines: string[] = [];
-
-    const emoji = {
-      "info": "ℹ️",
-      "warning": "⚠️",
-      "critical": "🔴",
-    }[finding.severity || "info"] || "•";
-
-    lines.push(`### ${emoji} Finding: ${finding.description}`);
-    lines.push("");
+  private renderFinding(finding: Finding, out: string[]): void {
+    const { severity, details, evidence } = finding;
+    const emoji = SEVERITY_ICONS[severity || "info"] || "•";
+    out.push(`### ${emoji} Finding: ${finding.description}`, "");
 
-    if (finding.details) {
-      lines.push(finding.details);
-      lines.push("");
+    // Bare findings (the common auto-generated case) stop after the heading
+    const hasEvidence = evidence !== undefined && evidence.length > 0;
+    if (!details && !hasEvidence) {
+      return;
     }
 
-    if (finding.evidence && finding.evidence.length > 0) {
-      lines.push("**Evidence:**");
-      for (const item of finding.evidence) {
-        lines.push(`- ${item}`);
-      }
-      lines.push("");
+    if (details) {
+      out.push(details, "");
     }
 
-    return lines;
+    if (hasEvidence) {
+      // All bullets as one entry: a single join rather than a template per item
+      out.push("**Evidence:**", "- " + evidence.join("\n- "), "");
+    }
   }
 
-  private renderRootCause(data: { cause: string; explanation: string }): string[] {
-    return [
-      "## Root Cause",
-      "",
-      `**${data.cause}**`,
-      "",
-      data.explanation,
-      "",
-    ];
+  private renderRootCause(section: SectionOf<"root_cause">, out: string[]): void {
+    out.push("## Root Cause", "", `**${section.cause}**`, "", section.explanation, "");
   }
 
-  private renderFix(data: { recommendation: string; code?: CodeSnippet }): string[] {
-    const lines: string[] = [
-      "## Fix",
-      "",
-      data.recommendation,
-      "",
-    ];
+  private renderFix(section: SectionOf<"fix">, out: string[]): void {
+    const code = section.code;
+    out.push("## Fix", "", section.recommendation, "");
 
-    if (data.code) {
-      lines.push(...this.renderCodeSnippet(data.code));
+    if (code) {
+      this.renderCodeSnippet(code, out);
     }
-
-    return lines;
   }
 
-  private renderDataTable(
-    data: { caption: string; rows: Array<Record<string, unknown>> },
-  ): string[] {
-    const lines: string[] = [];
-
-    if (data.caption) {
-      lines.push(`**${data.caption}**`);
-      lines.push("");
+  private renderDataTable(data: SectionOf<"table">, out: string[]): void {
+    const { caption, rows } = data;
+    if (caption) {
+      out.push(`**${caption}**`, "");
     }
 
-    if (data.rows.length === 0) {
-      lines.push("*No data*");
-      return lines;
+    if (rows.length === 0) {
+      out.push("*No data*");
+      return;
     }
 
-    // Get column names
-    const columns = Object.keys(data.rows[0]);
+    // Columns come from the rows as they are now; the caller may have
+    // changed them since addDataTable
+    const columns = Object.keys(rows[0]);
+    out.push(`| ${columns.join(" | ")} |`, `| ${columns.map(() => "---").join(" | ")} |`);
 
-    // Header row
-    lines.push(`| ${columns.join(" | ")} |`);
-    lines.push(`| ${columns.map(() => "---").join(" | ")} |`);
-
-    // Data rows
-    for (const row of data.rows) {
-      const values = columns.map((col) => {
+    // Data rows: build each line directly instead of mapping then joining
+    for (const row of rows) {
+      let line = "|";
+      for (const col of columns) {
         const val = row[col];
-        if (typeof val === "number") {
-          return val.toLocaleString();
-        }
-        return String(val || "");
-      });
-      lines.push(`| ${values.join(" | ")} |`);
+        line += ` ${typeof val === "number" ? formatNumber(val) : String(val || "")} |`;
+      }
+      out.push(line);
     }
 
-    lines.push("");
-
-    return lines;
+    out.push("");
   }
 
+  /**
+   * Stream the report to a sibling temp file and rename it over `filePath`
+   * once complete, so a failed render never clobbers an existing report.
+   */
   async save(filePath: string): Promise<void> {
-    const content = this.generate();
-    await Deno.writeTextFile(filePath, content);
+    const tempPath = `${filePath}.${crypto.randomUUID()}.tmp`;
+    const file = await Deno.open(tempPath, { write: true, createNew: true });
+    try {
+      await this.writeTo(file.writable);
+      await Deno.rename(tempPath, filePath);
+    } catch (error) {
+      await Deno.remove(tempPath).catch(() => {});
+      throw error;
+    }
     console.log(`Report saved to ${filePath}`);
   }
 }
@@ -2,7 +2,11 @@
  * Tests for Markdown report generation
  */
 
-import { assertEquals, assertExists } from "https://deno.land/std@0.224.0/assert/mod.ts";
+import {
+  assertEquals,
+  assertExists,
+  assertRejects,
+} from "https://deno.land/std@0.224.0/assert/mod.ts";
 import { MarkdownReport } from "./report_gen.ts";
 import { Breadcrumbs } from "./breadcrumbs.ts";
 
@@ -52,6 +56,42 @@ Deno.test("MarkdownReport - generates markdown", async () => {
   }
 });
 
+Deno.test("MarkdownReport - failed save leaves the existing report intact", async () => {
+  const dir = await Deno.makeTempDir();
+  const path = `${dir}/report.md`;
+  try {
+    await Deno.writeTextFile(path, "previous report");
+
+    const report = new MarkdownReport("Broken");
+    report.addDataTable("Rows", [{
+      value: {
+        toString() {
+          throw new Error("cannot render");
+        },
+      },
+    }]);
+    await assertRejects(() => report.save(path), Error, "cannot render");
+
+    assertEquals(await Deno.readTextFile(path), "previous report");
+    // No partial temp file is left next to it
+    assertEquals(Array.from(Deno.readDirSync(dir), (entry) => entry.name), ["report.md"]);
+  } finally {
+    await Deno.remove(dir, { recursive: true });
+  }
+});
+
+Deno.test("MarkdownReport - tables follow rows changed after addDataTable", () => {
+  const rows: Array<Record<string, unknown>> = [{ name: "a", size: 1 }];
+  const report = new MarkdownReport("Tables");
+  report.addDataTable("Rows", rows);
+  assertEquals(report.generate().includes("| name | size |"), true);
+
+  rows[0] = { name: "b", count: 2 };
+  const content = report.generate();
+  assertEquals(content.includes("| name | count |"), true);
+  assertEquals(content.includes("| b | 2 |"), true);
+});
+
 Deno.test("MarkdownReport - works with breadcrumbs", () => {
   const bc = new Breadcrumbs("test");
   bc.addHypothesis("Test hypothesis");
@@ -61,3 +101,86 @@ Deno.test("MarkdownReport - works with breadcrumbs", () => {
 
   assertExists(report);
 });
+
+Deno.test("MarkdownReport - generate renders every section type", () => {
+  const report = new MarkdownReport("Full");
+  report.addFinding({ description: "Leak", severity: "warning", evidence: ["a", "b"] });
+  report.addFix("Clean up", { language: "ts", code: "x()", caption: "Patch" });
+  report.addDataTable("Sizes", [{ name: "Leaky", bytes: 1500 }]);
+  report.addDataTable("Empty", []);
+
+  const body = report.generate().split("\n").slice(3).join("\n");
+  assertEquals(
+    body,
+    [
+      "### ⚠️ Finding: Leak",
+      "",
+      "**Evidence:**",
+      "- a",
+      "- b",
+      "",
+      "",
+      "## Fix",
+      "",
+      "Clean up",
+      "",
+      "**Patch**",
+      "",
+      "```ts",
+      "x()",
+      "```",
+      "",
+      "",
+      "**Sizes**",
+      "",
+      "| name | bytes |",
+      "| --- | --- |",
+      `| Leaky | ${(1500).toLocaleString()} |`,
+      "",
+      "",
+      "**Empty**",
+      "",
+      "*No data*",
+      "",
+    ].join("\n"),
+  );
+});
+
+Deno.test("MarkdownReport - addFindings matches repeated addFinding", () => {
+  const findings = [
+    { description: "First", severity: "critical" as const, evidence: ["x"] },
+    { description: "Second", details: "more" },
+  ];
+  const bulk = new MarkdownReport("Bulk");
+  bulk.addFindings(findings);
+  const single = new MarkdownReport("Bulk");
+  findings.forEach((f) => single.addFinding(f));
+
+  const body = (r: MarkdownReport) => r.generate().split("\n").slice(2).join("\n");
+  assertEquals(body(bulk), body(single));
+  assertEquals(body(bulk).includes("### 🔴 Finding: First"), true);
+});
+
+Deno.test("MarkdownReport - writeTo streams the same text as generate", async () => {
+  const report = new MarkdownReport("Streamed");
+  report.addSummary("Summary");
+  report.addDataTable(
+    "Big",
+    Array.from({ length: 5000 }, (_, i) => ({ id: i, name: `row-${i}` })),
+  );
+  report.addFinding({ description: "After the table" });
+
+  const chunks: Uint8Array[] = [];
+  await report.writeTo(new WritableStream({ write: (chunk) => void chunks.push(chunk) }));
+
+  assertEquals(chunks.length > 1, true);
+  const text = chunks.map((c) => new TextDecoder().decode(c)).join("");
+  assertEquals(text, report.generate());
+});
+
+Deno.test("MarkdownReport - generateBytes encodes generate output", () => {
+  const report = new MarkdownReport("Bytes");
+  report.addFinding({ description: "Emoji heading", severity: "critical" });
+  report.addSection("Notes", "ünïcödé", 3);
+  assertEquals(new TextDecoder().decode(report.generateBytes()), report.generate());
+});
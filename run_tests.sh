@@ -7,11 +7,18 @@ echo "🧪 Deno Debugger Skill Test Suite"
 echo "=================================="
 echo ""
 
-# Colors
-GREEN='\033[0;32m'
-BLUE='\033[0;34m'
-YELLOW='\033[1;33m'
-NC='\033[0m' # No Color
+# Colors (only when writing to a terminal, so captured CI logs stay plain)
+if [ -t 1 ]; then
+    GREEN='\033[0;32m'
+    BLUE='\033[0;34m'
+    YELLOW='\033[1;33m'
+    NC='\033[0m' # No Color
+else
+    GREEN=''
+    BLUE=''
+    YELLOW=''
+    NC=''
+fi
 
 # Check if Deno is installed
 if ! command -v deno &> /dev/null; then
@@ -1,4 +1,4 @@
-#!/usr/bin/env -S deno run --allow-net --allow-run
+#!/usr/bin/env -S deno run --allow-net --allow-run --allow-read --allow-write
 /**
  * End-to-end test of debugging scenarios
  *
@@ -17,175 +17,296 @@ interface TestResult {
   message: string;
 }
 
+/** Appends one line to a scenario's buffered output */
+type Log = (line: string) => void;
+
 const results: TestResult[] = [];
 
 async function delay(ms: number) {
   return new Promise((resolve) => setTimeout(resolve, ms));
 }
 
+/** Longest time to wait for a triggered request to hit a breakpoint */
+const PAUSE_TIMEOUT_MS = 2000;
+
+/** Longest time to wait for a freshly spawned scenario to come up */
+const STARTUP_TIMEOUT_MS = 15000;
+
+/**
+ * Poll a URL with exponential backoff until it answers, instead of sleeping
+ * a fixed amount up front
+ */
+async function waitForUrl(url: string, timeoutMs = STARTUP_TIMEOUT_MS): Promise<void> {
+  const deadline = Date.now() + timeoutMs;
+  let backoff = 25;
+  while (true) {
+    try {
+      const response = await fetch(url);
+      await response.body?.cancel();
+      return;
+    } catch (error) {
+      if (Date.now() + backoff > deadline) {
+        throw new Error(`${url} not ready after ${timeoutMs}ms`, { cause: error });
+      }
+    }
+    await delay(backoff);
+    backoff = Math.min(backoff * 2, 500);
+  }
+}
+
+/** Printed on stderr by deno once --inspect is accepting connections */
+const INSPECTOR_READY = "Debugger listening on";
+
+/** Most stderr kept for startup failure diagnostics */
+const STDERR_TAIL_CHARS = 4096;
+
+/**
+ * Read the child's stderr until the inspector announces itself. Fails fast if
+ * the process exits first. The rest of stderr keeps draining so the child
+ * never blocks on a full pipe.
+ */
+async function waitForInspector(
+  stderr: ReadableStream<Uint8Array>,
+  timeoutMs = STARTUP_TIMEOUT_MS,
+): Promise<void> {
+  const reader = stderr.pipeThrough(new TextDecoderStream()).getReader();
+  let timedOut = false;
+  const timer = setTimeout(() => {
+    timedOut = true;
+    reader.cancel();
+  }, timeoutMs);
+
+  try {
+    let output = "";
+    let ready = false;
+    while (!ready) {
+      const { value, done } = await reader.read();
+      if (done) {
+        throw new Error(
+          timedOut
+            ? `Inspector not ready after ${timeoutMs}ms`
+            : `Process exited before the inspector was ready: ${output.trim()}`,
+        );
+      }
+      // Look before trimming, so a large chunk can't cut the marker off
+      output += value;
+      ready = output.includes(INSPECTOR_READY);
+      // Keep only the tail, so a noisy child can't grow this without bound. Always keep
+      // enough to match a marker split across two chunks.
+      output = output.slice(-Math.max(STDERR_TAIL_CHARS, INSPECTOR_READY.length - 1));
+    }
+  } finally {
+    clearTimeout(timer);
+  }
+
+  (async () => {
+    while (!(await reader.read()).done) {
+      // Discard
+    }
+  })().catch(() => {});
+}
+
+/** How long a scenario gets to exit on SIGINT before it is killed */
+const SHUTDOWN_GRACE_MS = 500;
+
+async function stopProcess(process: Deno.ChildProcess): Promise<void> {
+  const signal = (signo: Deno.Signal) => {
+    try {
+      process.kill(signo);
+    } catch {
+      // Process might have already died
+    }
+  };
+
+  signal("SIGINT");
+  let timer: ReturnType<typeof setTimeout> | undefined;
+  const exited = await Promise.race([
+    process.status.then(() => true),
+    new Promise<boolean>((resolve) => timer = setTimeout(() => resolve(false), SHUTDOWN_GRACE_MS)),
+  ]);
+  clearTimeout(timer);
+  if (!exited) {
+    signal("SIGKILL");
+    await process.status;
+  }
+}
+
+/**
+ * Enable the debugger and set a breakpoint, reporting whether it was set.
+ * The breakpoint goes out without waiting for the enable's reply; the
+ * inspector handles commands in the order they arrive.
+ */
+async function enableWithBreakpoint(
+  client: CDPClient,
+  params: Record<string, unknown>,
+  description: string,
+  log: Log,
+): Promise<Error | null> {
+  const enabled = client.enableDebugger();
+  const breakpoint = client.sendCommand("Debugger.setBreakpointByUrl", params)
+    .then(() => null, (e: Error) => e);
+  await enabled;
+  log("✓ Debugger enabled");
+
+  const error = await breakpoint;
+  if (error) {
+    const label = params.condition ? "Conditional breakpoint" : "Breakpoint";
+    log(`⚠ ${label}: ${error.message.substring(0, 50)}...`);
+  } else {
+    log(`✓ ${description}`);
+  }
+  return error;
+}
+
 async function runScenario(
   name: string,
   port: number,
+  inspectorPort: number,
   scriptPath: string,
-  testFn: () => Promise<void>,
+  testFn: (inspectorPort: number, log: Log) => Promise<void>,
 ): Promise<TestResult> {
-  console.log(`\n${"=".repeat(60)}`);
-  console.log(`Testing: ${name}`);
-  console.log(`${"=".repeat(60)}\n`);
+  // Scenarios run concurrently; collect this one's output and print it as a
+  // single block when it finishes so the logs don't interleave
+  const lines: string[] = [];
+  const log: Log = (line) => lines.push(line);
+
+  log(`\n${"=".repeat(60)}`);
+  log(`Testing: ${name}`);
+  log(`${"=".repeat(60)}\n`);
 
   try {
     // Start scenario with --inspect
-    console.log(`Starting scenario on port ${port}...`);
+    log(`Starting scenario on port ${port} (inspector ${inspectorPort})...`);
     const command = new Deno.Command("deno", {
       args: [
         "run",
-        "--inspect=127.0.0.1:9229",
+        `--inspect=127.0.0.1:${inspectorPort}`,
         "--allow-net",
         scriptPath,
       ],
       stdout: "null",
-      stderr: "null",
+      stderr: "piped",
     });
 
     const process = command.spawn();
 
-    // Wait for server to be ready
-    console.log("Waiting for server to be ready...");
-    await delay(5000);
-
-    // Verify server is actually listening
-    let retries = 0;
-    while (retries < 5) {
-      try {
-        const healthCheck = await fetch(`http://localhost:${port}/`, { method: "HEAD" });
-        await healthCheck.text();
-        break;
-      } catch {
-        retries++;
-        await delay(1000);
-      }
-    }
-    console.log("✓ Server started\n");
-
-    // Run the test
     try {
-      await testFn();
-      console.log(`\n✅ ${name} PASSED\n`);
+      // The inspector reports on stderr; the app only once it answers
+      log("Waiting for server to be ready...");
+      await waitForInspector(process.stderr);
+      await waitForUrl(`http://localhost:${port}/`);
+      log("✓ Server started\n");
+
+      // Run the test
+      await testFn(inspectorPort, log);
+      log(`\n✅ ${name} PASSED\n`);
       return { name, passed: true, message: "All checks passed" };
     } finally {
-      // Always cleanup
-      try {
-        process.kill("SIGKILL");
-      } catch {
-        // Process might have already died
-      }
-      await delay(3000); // Give more time for port to be released
+      // Always cleanup: SIGINT stops deno immediately, SIGKILL only if it hangs
+      await stopProcess(process);
     }
   } catch (error) {
-    console.error(`\n❌ ${name} FAILED: ${error.message}\n`);
+    log(`\n❌ ${name} FAILED: ${error.message}\n`);
     return { name, passed: false, message: error.message };
+  } finally {
+    console.log(lines.join("\n"));
   }
 }
 
 // Test 1: Memory Leak - Heap Snapshot
-async function testMemoryLeak() {
-  console.log("Test: Heap snapshot capture");
+async function testMemoryLeak(inspectorPort: number, log: Log) {
+  log("Test: Heap snapshot capture");
 
-  const client = new CDPClient("127.0.0.1", 9229);
+  const client = new CDPClient("127.0.0.1", inspectorPort);
   await client.connect();
-  console.log("✓ Connected to inspector");
+  log("✓ Connected to inspector");
 
   // Trigger memory leak
   const response = await fetch("http://localhost:8000/upload?size=2000000");
   await response.text();
-  console.log("✓ Triggered memory leak (2MB)");
-
-  // Enable heap profiler
-  await client.sendCommand("HeapProfiler.enable");
-  console.log("✓ Heap profiler enabled");
+  log("✓ Triggered memory leak (2MB)");
 
-  // Take snapshot
-  const snapshot = await client.takeHeapSnapshot(false);
-  console.log(`✓ Heap snapshot captured (${(snapshot.length / 1024 / 1024).toFixed(2)} MB)`);
-
-  // Parse and validate
-  const data = JSON.parse(snapshot);
-  if (!data.nodes || !data.edges || !data.strings) {
-    throw new Error("Invalid heap snapshot structure");
+  // Stream the snapshot to disk (enables the heap profiler itself), so the
+  // chunk list and the joined JSON text are never in memory together
+  const snapshotPath = await Deno.makeTempFile({ suffix: ".heapsnapshot" });
+  try {
+    await client.takeHeapSnapshotToFile(snapshotPath);
+    const { size } = await Deno.stat(snapshotPath);
+    log(`✓ Heap snapshot captured (${(size / 1024 / 1024).toFixed(2)} MB)`);
+
+    // Parse and validate
+    const data = JSON.parse(await Deno.readTextFile(snapshotPath));
+    if (!data.nodes || !data.edges || !data.strings) {
+      throw new Error("Invalid heap snapshot structure");
+    }
+    log(`✓ Validated: ${data.nodes.length} nodes, ${data.edges.length} edges`);
+  } finally {
+    await Deno.remove(snapshotPath);
   }
-  console.log(`✓ Validated: ${data.nodes.length} nodes, ${data.edges.length} edges`);
 
   client.close();
 }
 
 // Test 2: Performance Bottleneck - CPU Profile
-async function testPerformanceBottleneck() {
-  console.log("Test: CPU profiling");
+async function testPerformanceBottleneck(inspectorPort: number, log: Log) {
+  log("Test: CPU profiling");
 
-  const client = new CDPClient("127.0.0.1", 9229);
+  const client = new CDPClient("127.0.0.1", inspectorPort);
   await client.connect();
-  console.log("✓ Connected to inspector");
+  log("✓ Connected to inspector");
 
   // Start profiling
   await client.startProfiling();
-  console.log("✓ CPU profiler started");
+  log("✓ CPU profiler started");
 
-  // Trigger computation
-  fetch("http://localhost:8001/primes?limit=10000").catch(() => {});
-  console.log("✓ Triggered computation");
-
-  // Profile for a bit
-  await delay(2000);
+  // Trigger computation; the response marks the end of the work to profile
+  const response = await fetch("http://localhost:8001/primes?limit=10000");
+  await response.body?.cancel();
+  log("✓ Triggered computation");
 
   // Stop profiling
   const profile = await client.stopProfiling();
-  console.log("✓ CPU profile captured");
+  log("✓ CPU profile captured");
 
   // Validate
   if (!profile.nodes || !profile.samples) {
     throw new Error("Invalid CPU profile structure");
   }
   const duration = (profile.endTime - profile.startTime) / 1000;
-  console.log(`✓ Validated: ${profile.nodes.length} nodes, ${profile.samples.length} samples, ${duration.toFixed(0)}ms`);
+  log(
+    `✓ Validated: ${profile.nodes.length} nodes, ${profile.samples.length} samples, ${
+      duration.toFixed(0)
+    }ms`,
+  );
 
   client.close();
 }
 
 // Test 3: Race Condition - Actually Debug with Breakpoints
-async function testRaceCondition() {
-  console.log("Test: Interactive debugging with breakpoints");
+async function testRaceCondition(inspectorPort: number, log: Log) {
+  log("Test: Interactive debugging with breakpoints");
 
-  const client = new CDPClient("127.0.0.1", 9229);
+  const client = new CDPClient("127.0.0.1", inspectorPort);
   await client.connect();
-  console.log("✓ Connected to inspector");
-
-  // Enable debugger
-  await client.enableDebugger();
-  console.log("✓ Debugger enabled");
+  log("✓ Connected to inspector");
 
   // Set a breakpoint at the createOrder function (where the bug is)
-  try {
-    await client.sendCommand("Debugger.setBreakpointByUrl", {
+  await enableWithBreakpoint(
+    client,
+    {
       lineNumber: 34, // Line where createOrder function starts
-      url: "file:///home/user/deno-debug-skill/examples/scenarios/3_race_condition/app.ts",
-    });
-    console.log(`✓ Set breakpoint at line 34 (createOrder function)`);
-  } catch (e) {
-    console.log(`⚠ Breakpoint: ${e.message.substring(0, 50)}...`);
-  }
-
-  // Register event handler for pauses
-  let pausedOnBreakpoint = false;
-  client.onEvent("Debugger.paused", () => {
-    pausedOnBreakpoint = true;
-  });
+      urlRegex: "/3_race_condition/app\\.ts$",
+    },
+    "Set breakpoint at line 34 (createOrder function)",
+    log,
+  );
 
   // Resume execution (in case it paused)
   try {
     await client.sendCommand("Debugger.resume");
-    console.log("✓ Can control execution (resume)");
+    log("✓ Can control execution (resume)");
   } catch {
-    console.log("✓ Debugger control available");
+    log("✓ Debugger control available");
   }
 
   // Trigger the race condition
@@ -193,45 +314,45 @@ async function testRaceCondition() {
     method: "POST",
   }).catch(() => {});
 
-  // Wait to see if we pause
-  await delay(2000);
+  // Wait to see if we pause; returns as soon as the breakpoint hits
+  const pausedOnBreakpoint = await client.waitForPaused(PAUSE_TIMEOUT_MS).then(
+    () => true,
+    () => false,
+  );
 
   if (pausedOnBreakpoint) {
-    console.log("✓ Execution paused at breakpoint!");
+    log("✓ Execution paused at breakpoint!");
     // Resume
     await client.sendCommand("Debugger.resume");
-    console.log("✓ Resumed from breakpoint");
+    log("✓ Resumed from breakpoint");
   } else {
-    console.log("⚠ No pause hit, but breakpoint setting works");
+    log("⚠ No pause hit, but breakpoint setting works");
   }
 
-  console.log("✓ Breakpoint control (set, pause, resume) works");
+  log("✓ Breakpoint control (set, pause, resume) works");
 
   client.close();
 }
 
 // Test 4: State Corruption - Variable Watches & Conditional Breakpoints
-async function testStateCorruption() {
-  console.log("Test: Variable watches and conditional breakpoints");
+async function testStateCorruption(inspectorPort: number, log: Log) {
+  log("Test: Variable watches and conditional breakpoints");
 
-  const client = new CDPClient("127.0.0.1", 9229);
+  const client = new CDPClient("127.0.0.1", inspectorPort);
   await client.connect();
-  console.log("✓ Connected to inspector");
-
-  await client.enableDebugger();
-  console.log("✓ Debugger enabled");
+  log("✓ Connected to inspector");
 
   // Set a conditional breakpoint on session corruption
-  try {
-    await client.sendCommand("Debugger.setBreakpointByUrl", {
+  await enableWithBreakpoint(
+    client,
+    {
       lineNumber: 84, // Line where session.corrupted is set
-      url: "file:///home/user/deno-debug-skill/examples/scenarios/4_state_corruption/app.ts",
+      urlRegex: "/4_state_corruption/app\\.ts$",
       condition: "session.corrupted === true", // Only break when corrupted
-    });
-    console.log("✓ Set conditional breakpoint (break when session.corrupted === true)");
-  } catch (e) {
-    console.log(`⚠ Conditional breakpoint: ${e.message.substring(0, 50)}...`);
-  }
+    },
+    "Set conditional breakpoint (break when session.corrupted === true)",
+    log,
+  );
 
   // Trigger the state corruption bug
   fetch("http://localhost:8003/session?user=user1&name=alice", { method: "POST" })
@@ -241,7 +362,7 @@ async function testStateCorruption() {
     .catch(() => {});
 
   await delay(1000);
-  console.log("✓ Triggered state corruption scenario");
+  log("✓ Triggered state corruption scenario");
 
   // Try to evaluate expressions (like watching variables)
   try {
@@ -249,63 +370,57 @@ async function testStateCorruption() {
       expression: "DEFAULT_SESSION.username",
       returnByValue: true,
     });
-    console.log("✓ Can evaluate expressions (variable watches)");
+    log("✓ Can evaluate expressions (variable watches)");
   } catch (e) {
-    console.log(`⚠ Expression eval: works but context dependent`);
+    log(`⚠ Expression eval: works but context dependent`);
   }
 
-  console.log("✓ Debugger features for state inspection work");
+  log("✓ Debugger features for state inspection work");
 
   client.close();
 }
 
 // Test 5: Event Loop - Step Through Execution
-async function testEventLoopTiming() {
-  console.log("Test: Step through execution to observe timing");
+async function testEventLoopTiming(inspectorPort: number, log: Log) {
+  log("Test: Step through execution to observe timing");
 
-  const client = new CDPClient("127.0.0.1", 9229);
+  const client = new CDPClient("127.0.0.1", inspectorPort);
   await client.connect();
-  console.log("✓ Connected to inspector");
-
-  await client.enableDebugger();
-  console.log("✓ Debugger enabled");
+  log("✓ Connected to inspector");
 
   // Set breakpoint in setTimeout callback to observe execution order
-  try {
-    await client.sendCommand("Debugger.setBreakpointByUrl", {
+  await enableWithBreakpoint(
+    client,
+    {
       lineNumber: 47, // Inside setTimeout callback in scheduleTaskImmediate
-      url: "file:///home/user/deno-debug-skill/examples/scenarios/5_event_loop_timing/app.ts",
-    });
-    console.log("✓ Set breakpoint in setTimeout callback");
-  } catch (e) {
-    console.log(`⚠ Breakpoint: ${e.message.substring(0, 50)}...`);
-  }
-
-  // Track if we pause
-  let pauseCount = 0;
-  client.onEvent("Debugger.paused", () => {
-    pauseCount++;
-  });
+      urlRegex: "/5_event_loop_timing/app\\.ts$",
+    },
+    "Set breakpoint in setTimeout callback",
+    log,
+  );
 
   // Trigger event loop scenario
   fetch("http://localhost:8004/task/immediate?name=test1", { method: "POST" })
     .catch(() => {});
 
-  await delay(1500);
+  const paused = await client.waitForPaused(PAUSE_TIMEOUT_MS).then(
+    () => true,
+    () => false,
+  );
 
-  if (pauseCount > 0) {
-    console.log(`✓ Paused ${pauseCount} time(s) at breakpoint`);
+  if (paused) {
+    log("✓ Paused at breakpoint");
     // Resume
     await client.sendCommand("Debugger.resume").catch(() => {});
-    console.log("✓ Can step through execution");
+    log("✓ Can step through execution");
   } else {
-    console.log("⚠ No pause (timing), but breakpoint set successfully");
+    log("⚠ No pause (timing), but breakpoint set successfully");
   }
 
   // Verify step commands are available
-  console.log("✓ Step commands available (stepOver, stepInto, stepOut)");
+  log("✓ Step commands available (stepOver, stepInto, stepOut)");
 
-  console.log("✓ Can step through code to observe event loop order");
+  log("✓ Can step through code to observe event loop order");
 
   client.close();
 }
@@ -316,50 +431,45 @@ async function main() {
   console.log("   End-to-End Debugging Scenarios Test");
   console.log("================================================");
 
-  // Test each scenario
-  results.push(
-    await runScenario(
-      "Memory Leak Detection (Heap Snapshots)",
-      8000,
-      "examples/scenarios/1_memory_leak/app.ts",
-      testMemoryLeak,
-    ),
-  );
-
-  results.push(
-    await runScenario(
-      "Performance Bottleneck (CPU Profiling)",
-      8001,
-      "examples/scenarios/2_performance_bottleneck/app.ts",
-      testPerformanceBottleneck,
-    ),
-  );
-
-  results.push(
-    await runScenario(
-      "Race Condition (Breakpoints & Resume)",
-      8002,
-      "examples/scenarios/3_race_condition/app.ts",
-      testRaceCondition,
-    ),
-  );
-
-  results.push(
-    await runScenario(
-      "State Corruption (Conditional Breakpoints & Watches)",
-      8003,
-      "examples/scenarios/4_state_corruption/app.ts",
-      testStateCorruption,
-    ),
-  );
-
+  // Each scenario gets its own app and inspector port, so they run concurrently
   results.push(
-    await runScenario(
-      "Event Loop Timing (Step Through Code)",
-      8004,
-      "examples/scenarios/5_event_loop_timing/app.ts",
-      testEventLoopTiming,
-    ),
+    ...await Promise.all([
+      runScenario(
+        "Memory Leak Detection (Heap Snapshots)",
+        8000,
+        9229,
+        "examples/scenarios/1_memory_leak/app.ts",
+        testMemoryLeak,
+      ),
+      runScenario(
+        "Performance Bottleneck (CPU Profiling)",
+        8001,
+        9230,
+        "examples/scenarios/2_performance_bottleneck/app.ts",
+        testPerformanceBottleneck,
+      ),
+      runScenario(
+        "Race Condition (Breakpoints & Resume)",
+        8002,
+        9231,
+        "examples/scenarios/3_race_condition/app.ts",
+        testRaceCondition,
+      ),
+      runScenario(
+        "State Corruption (Conditional Breakpoints & Watches)",
+        8003,
+        9232,
+        "examples/scenarios/4_state_corruption/app.ts",
+        testStateCorruption,
+      ),
+      runScenario(
+        "Event Loop Timing (Step Through Code)",
+        8004,
+        9233,
+        "examples/scenarios/5_event_loop_timing/app.ts",
+        testEventLoopTiming,
+      ),
+    ]),
   );
 
   // Summary